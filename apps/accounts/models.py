@@ -28,12 +28,26 @@ class User(AbstractUser):
         db_table = "users"
         ordering = ["-created_at"]
 
-    def has_quota(self) -> bool:
-        return self.api_calls_this_month < self.api_quota_monthly
+    @classmethod
+    def reserve_quota(cls, user_id) -> bool:
+        """Atomically consume one API call if quota remains.
 
-    def increment_usage(self) -> None:
-        self.api_calls_this_month = models.F("api_calls_this_month") + 1
-        self.save(update_fields=["api_calls_this_month"])
+        A single conditional UPDATE replaces the fetch → check → save dance,
+        so concurrent requests cannot both pass the quota check.
+        """
+        return bool(
+            cls.objects.filter(
+                pk=user_id,
+                api_calls_this_month__lt=models.F("api_quota_monthly"),
+            ).update(api_calls_this_month=models.F("api_calls_this_month") + 1)
+        )
+
+    @classmethod
+    def release_quota(cls, user_id) -> None:
+        """Return a reserved API call, e.g. when the agent run fails."""
+        cls.objects.filter(pk=user_id, api_calls_this_month__gt=0).update(
+            api_calls_this_month=models.F("api_calls_this_month") - 1
+        )
 
 
 class APIKey(models.Model):
@@ -43,7 +57,9 @@ class APIKey(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="api_keys")
     name = models.CharField(max_length=100)
     key_hash = models.CharField(max_length=128, unique=True)
-    prefix = models.CharField(max_length=8, help_text="First 8 chars for identification")
+    prefix = models.CharField(
+        max_length=8, db_index=True, help_text="First 8 chars for identification"
+    )
     is_active = models.BooleanField(default=True)
     last_used_at = models.DateTimeField(null=True, blank=True)
     expires_at = models.DateTimeField(null=True, blank=True)
@@ -1,6 +1,7 @@
 """Account serializers."""
 
 from django.contrib.auth import get_user_model
+from drf_accelerator import FastSerializationMixin
 from rest_framework import serializers
 
 from .models import APIKey
@@ -32,8 +33,10 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return User.objects.create_user(**validated_data)
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
-    usage_percentage = serializers.SerializerMethodField()
+class UserProfileSerializer(FastSerializationMixin, serializers.ModelSerializer):
+    # Annotated by ProfileView in SQL; defaults to 0.0 for freshly
+    # registered users serialized without the annotation.
+    usage_percentage = serializers.FloatField(read_only=True, default=0.0)
 
     class Meta:
         model = User
@@ -50,13 +53,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "api_quota_monthly", "api_calls_this_month", "created_at"]
 
-    def get_usage_percentage(self, obj) -> float:
-        if obj.api_quota_monthly == 0:
-            return 0.0
-        return round((obj.api_calls_this_month / obj.api_quota_monthly) * 100, 1)
 
-
-class APIKeySerializer(serializers.ModelSerializer):
+class APIKeySerializer(FastSerializationMixin, serializers.ModelSerializer):
     class Meta:
         model = APIKey
         fields = ["id", "name", "prefix", "is_active", "last_used_at", "expires_at", "created_at"]
@@ -31,6 +31,12 @@ class UsageEvent(models.Model):
         db_table = "usage_events"
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["user", "created_at"]),
+            # Covers the usage_summary aggregates so Postgres can serve them
+            # with an index-only scan instead of per-row heap fetches.
+            models.Index(
+                fields=["user", "created_at"],
+                include=["input_tokens", "output_tokens", "latency_ms", "event_type"],
+                name="usage_user_time_covering",
+            ),
             models.Index(fields=["event_type", "created_at"]),
         ]
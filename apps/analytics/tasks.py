@@ -3,24 +3,61 @@
 import logging
 
 from celery import shared_task
+from django.db.models import Count
 
 logger = logging.getLogger(__name__)
 
 
+@shared_task
+def record_usage_events(events: list[dict]) -> dict:
+    """Batch-insert usage events emitted by API and worker hot paths.
+
+    Callers buffer events and hand over a batch instead of one INSERT per
+    event; conflicts on a caller-supplied ``id`` are upserted so redelivered
+    batches stay idempotent.
+    """
+    from .models import UsageEvent
+
+    objs = [UsageEvent(**event) for event in events]
+    UsageEvent.objects.bulk_create(
+        objs,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["input_tokens", "output_tokens", "latency_ms", "metadata"],
+    )
+    return {"recorded": len(objs)}
+
+
 @shared_task
 def update_collection_stats() -> dict:
     """Periodic task to refresh cached collection statistics."""
     from apps.documents.models import Collection, Document, DocumentChunk
 
-    updated = 0
-    for collection in Collection.objects.all():
-        doc_count = collection.documents.filter(status=Document.Status.COMPLETED).count()
-        chunk_count = DocumentChunk.objects.filter(document__collection=collection).count()
+    doc_counts = dict(
+        Document.objects.filter(status=Document.Status.COMPLETED)
+        .values_list("collection_id")
+        .annotate(c=Count("id"))
+    )
+    chunk_counts = dict(
+        DocumentChunk.objects.values_list("collection_id").annotate(c=Count("id"))
+    )
+
+    to_update = []
+    for collection in Collection.objects.only(
+        "id", "document_count", "total_chunks"
+    ).iterator(chunk_size=2000):
+        doc_count = doc_counts.get(collection.id, 0)
+        chunk_count = chunk_counts.get(collection.id, 0)
         if collection.document_count != doc_count or collection.total_chunks != chunk_count:
             collection.document_count = doc_count
             collection.total_chunks = chunk_count
-            collection.save(update_fields=["document_count", "total_chunks"])
-            updated += 1
+            to_update.append(collection)
+
+    if to_update:
+        Collection.objects.bulk_update(
+            to_update, ["document_count", "total_chunks"], batch_size=1000
+        )
 
-    logger.info("Updated stats for %d collections", updated)
-    return {"updated": updated}
+    logger.info("Updated stats for %d collections", len(to_update))
+    return {"updated": len(to_update)}
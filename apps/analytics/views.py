@@ -1,6 +1,10 @@
 """Analytics views — usage dashboards."""
 
-from django.db.models import Avg, Count, Sum
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Sum
 from django.db.models.functions import TruncDate
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
@@ -9,41 +13,69 @@ from rest_framework.response import Response
 
 from .models import UsageEvent
 
+USAGE_SUMMARY_CACHE_TTL = 300  # seconds
+
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def usage_summary(request):
-    """Return usage summary for the authenticated user."""
+    """Return usage summary for the authenticated user (cached for 5 minutes)."""
     days = int(request.query_params.get("days", 30))
+
+    # Bucketing the key by TTL window means stale entries simply fall out of
+    # rotation — no explicit invalidation needed on write.
+    bucket = int(time.time() // USAGE_SUMMARY_CACHE_TTL)
+    cache_key = f"usage:{request.user.id}:{days}:{bucket}"
+    payload = cache.get_or_set(
+        cache_key,
+        lambda: _compute_usage_summary(request.user, days),
+        USAGE_SUMMARY_CACHE_TTL,
+    )
+    return Response(payload)
+
+
+def _compute_usage_summary(user, days: int) -> dict:
     since = timezone.now() - timezone.timedelta(days=days)
 
-    events = UsageEvent.objects.filter(user=request.user, created_at__gte=since)
+    events = UsageEvent.objects.filter(user=user, created_at__gte=since)
 
     summary = events.aggregate(
-        total_queries=Count("id", filter=Count("id", filter=None) and None) or Count("id"),
+        total_queries=Count("id"),
         total_input_tokens=Sum("input_tokens"),
         total_output_tokens=Sum("output_tokens"),
         avg_latency_ms=Avg("latency_ms"),
     )
 
-    daily_usage = (
+    # One GROUP BY (date, event_type) scan over the (user, created_at) index,
+    # pivoted in Python into the daily and per-type breakdowns.
+    grouped = (
         events.annotate(date=TruncDate("created_at"))
-        .values("date")
-        .annotate(count=Count("id"), tokens=Sum("input_tokens") + Sum("output_tokens"))
+        .values("date", "event_type")
+        .annotate(count=Count("id"), tokens=Sum(F("input_tokens") + F("output_tokens")))
         .order_by("date")
     )
 
-    by_type = (
-        events.values("event_type")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
+    daily_counts = defaultdict(int)
+    daily_tokens = defaultdict(int)
+    type_counts = defaultdict(int)
+    for row in grouped:
+        date = row["date"]
+        daily_counts[date] += row["count"]
+        daily_tokens[date] += row["tokens"] or 0
+        type_counts[row["event_type"]] += row["count"]
 
-    return Response(
-        {
-            "period_days": days,
-            "summary": summary,
-            "daily_usage": list(daily_usage),
-            "by_event_type": list(by_type),
-        }
-    )
+    daily_usage = [
+        {"date": date, "count": count, "tokens": daily_tokens[date]}
+        for date, count in sorted(daily_counts.items())
+    ]
+    by_type = [
+        {"event_type": event_type, "count": count}
+        for event_type, count in sorted(type_counts.items(), key=lambda kv: -kv[1])
+    ]
+
+    return {
+        "period_days": days,
+        "summary": summary,
+        "daily_usage": daily_usage,
+        "by_event_type": by_type,
+    }
@@ -1,11 +1,15 @@
 """WebSocket consumer for streaming AI responses."""
 
-import json
 import logging
 import time
+from datetime import timedelta
 
+import orjson
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebSocketConsumer
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 
 from apps.accounts.models import User
 from apps.documents.models import Collection
@@ -15,6 +19,15 @@ from .models import Conversation, Message
 
 logger = logging.getLogger(__name__)
 
+# Coalesce streamed tokens into windows of this size before sending, so a
+# fast LLM stream doesn't cost one JSON encode + socket flush per token.
+TOKEN_FLUSH_INTERVAL = 0.02  # seconds
+
+
+def _dumps(payload: dict) -> str:
+    """orjson-encode a frame payload for a text WebSocket message."""
+    return orjson.dumps(payload).decode()
+
 
 class ChatConsumer(AsyncWebSocketConsumer):
     """WebSocket consumer that streams LangGraph agent responses token-by-token."""
@@ -37,8 +50,8 @@ class ChatConsumer(AsyncWebSocketConsumer):
 
     async def receive(self, text_data):
         try:
-            data = json.loads(text_data)
-        except json.JSONDecodeError:
+            data = orjson.loads(text_data)
+        except orjson.JSONDecodeError:
             await self.send_error("Invalid JSON")
             return
 
@@ -47,25 +60,28 @@ class ChatConsumer(AsyncWebSocketConsumer):
             await self.send_error("Empty message")
             return
 
-        # Check quota
-        has_quota = await self._check_quota()
-        if not has_quota:
+        # Reserve quota atomically before doing any work
+        if not await self._reserve_quota():
             await self.send_error("Monthly API quota exceeded")
             return
 
         collection_id = data.get("collection_id")
         agent_mode = data.get("agent_mode", "qa")
 
-        # Get or create conversation
-        conversation = await self._get_or_create_conversation(
-            message, collection_id, agent_mode
-        )
-
-        # Save user message
-        await self._save_message(conversation, Message.Role.USER, message)
-
-        # Build history
-        history = await self._get_history(conversation)
+        # Conversation resolution can fail (unknown conversation or
+        # collection id) — release the reserved quota unit instead of
+        # consuming it for a request that never ran.
+        try:
+            conversation = await self._get_or_create_conversation(
+                message, collection_id, agent_mode
+            )
+            # Build history (the current message is persisted at end of turn)
+            history, prev_retrieved_ids = await self._get_history(conversation)
+        except Exception:
+            logger.exception("Conversation resolution failed")
+            await self._release_quota()
+            await self.send_error("Invalid conversation or collection")
+            return
 
         # Stream response
         start = time.time()
@@ -73,11 +89,24 @@ class ChatConsumer(AsyncWebSocketConsumer):
         sources = []
         model_used = ""
 
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=_dumps({
             "type": "stream_start",
             "conversation_id": str(conversation.id),
         }))
 
+        token_buffer: list[str] = []
+        last_flush = time.monotonic()
+
+        async def flush_tokens():
+            nonlocal last_flush
+            if token_buffer:
+                await self.send(text_data=_dumps({
+                    "type": "token",
+                    "content": "".join(token_buffer),
+                }))
+                token_buffer.clear()
+            last_flush = time.monotonic()
+
         try:
             qdrant_collection = str(conversation.collection_id) if conversation.collection_id else None
 
@@ -87,38 +116,39 @@ class ChatConsumer(AsyncWebSocketConsumer):
                 collection_id=qdrant_collection,
                 agent_mode=agent_mode,
                 user_id=str(self.user.id),
+                prev_retrieved_ids=prev_retrieved_ids,
             ):
                 if event["type"] == "token":
                     full_response += event["content"]
-                    await self.send(text_data=json.dumps({
-                        "type": "token",
-                        "content": event["content"],
-                    }))
+                    token_buffer.append(event["content"])
+                    if time.monotonic() - last_flush >= TOKEN_FLUSH_INTERVAL:
+                        await flush_tokens()
                 elif event["type"] == "sources":
                     sources = event["sources"]
                 elif event["type"] == "metadata":
                     model_used = event.get("model", "")
 
+            await flush_tokens()
+
         except Exception as e:
             logger.exception("Streaming error")
+            await self._release_quota()
             await self.send_error(f"Agent error: {str(e)[:200]}")
             return
 
         latency_ms = int((time.time() - start) * 1000)
 
-        # Save assistant message
-        await self._save_message(
+        # Persist both sides of the turn in one batched, atomic write
+        await self._save_turn(
             conversation,
-            Message.Role.ASSISTANT,
+            message,
             full_response,
             sources=sources,
             model_used=model_used,
             latency_ms=latency_ms,
         )
 
-        await self._increment_usage()
-
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=_dumps({
             "type": "stream_end",
             "sources": sources,
             "model_used": model_used,
@@ -126,19 +156,17 @@ class ChatConsumer(AsyncWebSocketConsumer):
         }))
 
     async def send_error(self, detail: str):
-        await self.send(text_data=json.dumps({"type": "error", "detail": detail}))
+        await self.send(text_data=_dumps({"type": "error", "detail": detail}))
 
     # ---- Database helpers ----
 
     @database_sync_to_async
-    def _check_quota(self) -> bool:
-        user = User.objects.get(id=self.user.id)
-        return user.has_quota()
+    def _reserve_quota(self) -> bool:
+        return User.reserve_quota(self.user.id)
 
     @database_sync_to_async
-    def _increment_usage(self):
-        user = User.objects.get(id=self.user.id)
-        user.increment_usage()
+    def _release_quota(self):
+        User.release_quota(self.user.id)
 
     @database_sync_to_async
     def _get_or_create_conversation(self, message, collection_id, agent_mode):
@@ -158,15 +186,44 @@ class ChatConsumer(AsyncWebSocketConsumer):
 
     @database_sync_to_async
     def _get_history(self, conversation):
-        return list(
-            conversation.messages.order_by("created_at").values_list("role", "content")
-        )
+        # Last K messages via an indexed keyset scan (_save_turn assigns
+        # each turn strictly increasing timestamps), re-ordered oldest-first
+        rows = list(
+            conversation.messages.order_by("-created_at", "-id").values_list(
+                "role", "content", "sources"
+            )[: settings.CHAT_HISTORY_WINDOW]
+        )[::-1]
+        history = [(role, content) for role, content, _ in rows]
+
+        # Point ids from the latest assistant turn let follow-up queries
+        # reuse its retrieved context instead of searching again.
+        prev_ids: list[str] = []
+        for role, _, sources in reversed(rows):
+            if role == Message.Role.ASSISTANT and sources:
+                prev_ids = [s["point_id"] for s in sources if s.get("point_id")]
+                break
+        return history, prev_ids
 
     @database_sync_to_async
-    def _save_message(self, conversation, role, content, **kwargs):
-        return Message.objects.create(
-            conversation=conversation,
-            role=role,
-            content=content,
-            **kwargs,
-        )
+    def _save_turn(self, conversation, user_content, assistant_content, **kwargs):
+        # Distinct timestamps keep the turn ordered: UUID ids are random,
+        # so created_at is the only deterministic sort key.
+        now = timezone.now()
+        with transaction.atomic():
+            Message.objects.bulk_create(
+                [
+                    Message(
+                        conversation=conversation,
+                        role=Message.Role.USER,
+                        content=user_content,
+                        created_at=now,
+                    ),
+                    Message(
+                        conversation=conversation,
+                        role=Message.Role.ASSISTANT,
+                        content=assistant_content,
+                        created_at=now + timedelta(microseconds=1),
+                        **kwargs,
+                    ),
+                ]
+            )
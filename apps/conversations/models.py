@@ -4,6 +4,7 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from apps.documents.models import Collection
 
@@ -70,11 +71,16 @@ class Message(models.Model):
     latency_ms = models.PositiveIntegerField(null=True, blank=True)
     model_used = models.CharField(max_length=100, blank=True)
     metadata = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # default (not auto_now_add) so a bulk-created turn can assign strictly
+    # increasing timestamps — ids are random UUIDs and cannot break ties.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         db_table = "messages"
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["conversation", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"[{self.role}] {self.content[:80]}"
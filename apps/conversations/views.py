@@ -2,12 +2,18 @@
 
 import logging
 import time
+from datetime import timedelta
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.accounts.models import User
 from apps.documents.models import Collection
 from core.agents.graph import run_agent_graph
 
@@ -25,7 +31,16 @@ class ConversationListCreateView(generics.ListCreateAPIView):
     serializer_class = ConversationSerializer
 
     def get_queryset(self):
-        return Conversation.objects.filter(user=self.request.user, is_archived=False)
+        return Conversation.objects.filter(user=self.request.user, is_archived=False).only(
+            "id",
+            "collection_id",
+            "title",
+            "agent_mode",
+            "metadata",
+            "is_archived",
+            "created_at",
+            "updated_at",
+        ).annotate(message_count=Count("messages"))
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -36,7 +51,11 @@ class ConversationDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
     def get_queryset(self):
-        return Conversation.objects.filter(user=self.request.user)
+        return (
+            Conversation.objects.filter(user=self.request.user)
+            .annotate(message_count=Count("messages"))
+            .prefetch_related("messages")
+        )
 
 
 @api_view(["POST"])
@@ -48,43 +67,55 @@ def chat(request):
     data = serializer.validated_data
 
     user = request.user
-    if not user.has_quota():
+    if not User.reserve_quota(user.pk):
         return Response(
             {"detail": "Monthly API quota exceeded."},
             status=status.HTTP_429_TOO_MANY_REQUESTS,
         )
 
-    # Get or create conversation
-    conversation = _get_or_create_conversation(user, data)
-
-    # Save user message
-    user_msg = Message.objects.create(
-        conversation=conversation,
-        role=Message.Role.USER,
-        content=data["message"],
-    )
-
-    # Build conversation history
-    history = list(
-        conversation.messages.order_by("created_at").values_list("role", "content")
-    )
-
-    # Determine collection for RAG
-    collection_id = str(conversation.collection_id) if conversation.collection_id else None
-
-    # Run agent graph
+    # Everything between the reservation and a successful agent run must
+    # release the quota unit on failure — an unknown conversation or
+    # collection would otherwise consume it permanently.
     start = time.time()
-    result = run_agent_graph(
-        query=data["message"],
-        history=[(r, c) for r, c in history],
-        collection_id=collection_id,
-        agent_mode=conversation.agent_mode,
-        user_id=str(user.id),
-    )
+    try:
+        # Get or create conversation
+        conversation = _get_or_create_conversation(user, data)
+
+        # Build the user message, deferring the INSERT to the end-of-turn batch
+        user_msg = Message(
+            conversation=conversation,
+            role=Message.Role.USER,
+            content=data["message"],
+        )
+
+        # Build conversation history — last K messages via an indexed keyset scan
+        rows = list(
+            conversation.messages.order_by("-created_at", "-id").values_list(
+                "role", "content", "sources"
+            )[: settings.CHAT_HISTORY_WINDOW]
+        )[::-1]
+        history = [(role, content) for role, content, _ in rows]
+        prev_retrieved_ids = _previous_point_ids(rows)
+
+        # Determine collection for RAG
+        collection_id = str(conversation.collection_id) if conversation.collection_id else None
+
+        # Run agent graph
+        result = run_agent_graph(
+            query=data["message"],
+            history=history,
+            collection_id=collection_id,
+            agent_mode=conversation.agent_mode,
+            user_id=str(user.id),
+            prev_retrieved_ids=prev_retrieved_ids,
+        )
+    except Exception:
+        User.release_quota(user.pk)
+        raise
     latency_ms = int((time.time() - start) * 1000)
 
-    # Save assistant message
-    assistant_msg = Message.objects.create(
+    # Persist both sides of the turn in one batched, atomic write
+    assistant_msg = Message(
         conversation=conversation,
         role=Message.Role.ASSISTANT,
         content=result["answer"],
@@ -93,8 +124,12 @@ def chat(request):
         latency_ms=latency_ms,
         metadata=result.get("metadata", {}),
     )
-
-    user.increment_usage()
+    # Distinct timestamps keep the turn ordered: UUID ids are random, so
+    # created_at is the only deterministic sort key.
+    user_msg.created_at = timezone.now()
+    assistant_msg.created_at = user_msg.created_at + timedelta(microseconds=1)
+    with transaction.atomic():
+        Message.objects.bulk_create([user_msg, assistant_msg])
 
     return Response(
         {
@@ -110,6 +145,14 @@ def chat(request):
     )
 
 
+def _previous_point_ids(rows: list[tuple]) -> list[str]:
+    """Qdrant point ids from the most recent assistant turn's sources."""
+    for role, _, sources in reversed(rows):
+        if role == Message.Role.ASSISTANT and sources:
+            return [s["point_id"] for s in sources if s.get("point_id")]
+    return []
+
+
 def _get_or_create_conversation(user, data: dict) -> Conversation:
     if data.get("conversation_id"):
         return Conversation.objects.get(id=data["conversation_id"], user=user)
@@ -3,6 +3,7 @@
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 
@@ -27,6 +28,11 @@ class Collection(models.Model):
         db_table = "collections"
         ordering = ["-updated_at"]
         unique_together = [("owner", "name")]
+        indexes = [
+            # JSONB path queries (e.g. metadata__auto_cleanup in the cleanup
+            # task) scan sequentially without a GIN index.
+            GinIndex(fields=["metadata"], name="collection_metadata_gin"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.document_count} docs)"
@@ -50,19 +56,26 @@ class Document(models.Model):
     file_type = models.CharField(max_length=10)
     file_size_bytes = models.PositiveIntegerField()
     status = models.CharField(
-        max_length=20, choices=Status.choices, default=Status.PENDING
+        max_length=20, choices=Status.choices, default=Status.PENDING, db_index=True
     )
     error_message = models.TextField(blank=True)
     chunk_count = models.PositiveIntegerField(default=0)
     processing_time_seconds = models.FloatField(null=True, blank=True)
     metadata = models.JSONField(default=dict, blank=True)
-    content_hash = models.CharField(max_length=64, blank=True, help_text="SHA-256 of file content")
+    content_hash = models.CharField(
+        max_length=64, blank=True, db_index=True, help_text="BLAKE3 of file content"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "documents"
         ordering = ["-created_at"]
+        indexes = [
+            # Satisfies the list endpoint's filter + default ordering in one
+            # index scan.
+            models.Index(fields=["collection", "status", "-created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.title} [{self.status}]"
@@ -76,6 +89,9 @@ class DocumentChunk(models.Model):
         Document, on_delete=models.CASCADE, related_name="chunks"
     )
     chunk_index = models.PositiveIntegerField()
+    # Denormalized from document.collection so per-collection scans (stats,
+    # cleanup) prune by an indexed local column instead of joining documents.
+    collection_id = models.UUIDField(db_index=True, null=True, blank=True)
     content = models.TextField()
     token_count = models.PositiveIntegerField(default=0)
     qdrant_point_id = models.CharField(max_length=64, blank=True)
@@ -1,10 +1,17 @@
 """Document serializers."""
 
+import os
+
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework import serializers
 
 from .models import Collection, Document, DocumentChunk
 
+# Ownership of a collection rarely changes — a short TTL keeps repeated
+# uploads into the same collection from hitting Postgres every time.
+COLLECTION_CACHE_TTL = 60
+
 
 class CollectionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -61,6 +68,23 @@ class DocumentSerializer(serializers.ModelSerializer):
         ]
 
 
+class DocumentListSerializer(serializers.ModelSerializer):
+    """Trimmed serializer for paginated listings — skips metadata (JSONB)
+    and the file path, which dominate row width on wide documents."""
+
+    class Meta:
+        model = Document
+        fields = [
+            "id",
+            "collection",
+            "title",
+            "file_type",
+            "status",
+            "chunk_count",
+            "created_at",
+        ]
+
+
 class DocumentUploadSerializer(serializers.Serializer):
     file = serializers.FileField()
     collection_id = serializers.UUIDField()
@@ -68,11 +92,13 @@ class DocumentUploadSerializer(serializers.Serializer):
     metadata = serializers.JSONField(required=False, default=dict)
 
     def validate_file(self, value):
-        ext = value.name.rsplit(".", 1)[-1].lower()
+        ext = os.path.splitext(value.name)[1][1:].lower()
         if ext not in settings.SUPPORTED_FILE_TYPES:
             raise serializers.ValidationError(
-                f"Unsupported file type '.{ext}'. Supported: {settings.SUPPORTED_FILE_TYPES}"
+                f"Unsupported file type '.{ext}'. "
+                f"Supported: {', '.join(sorted(settings.SUPPORTED_FILE_TYPES))}"
             )
+        self.file_type = ext
         max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
         if value.size > max_bytes:
             raise serializers.ValidationError(
@@ -81,7 +107,14 @@ class DocumentUploadSerializer(serializers.Serializer):
         return value
 
     def validate_collection_id(self, value):
+        # Fetch (rather than exists-check) so the view can reuse the instance
+        # instead of running a second query for the same row.
         user = self.context["request"].user
-        if not Collection.objects.filter(id=value, owner=user).exists():
+        self.collection = cache.get_or_set(
+            f"col:{user.id}:{value}",
+            lambda: Collection.objects.filter(id=value, owner=user).only("id", "name").first(),
+            COLLECTION_CACHE_TTL,
+        )
+        if self.collection is None:
             raise serializers.ValidationError("Collection not found.")
         return value
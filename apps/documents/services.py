@@ -3,18 +3,42 @@
 import hashlib
 import logging
 import time
+from contextlib import nullcontext
 
-from django.db import transaction
+import blake3
+import pgbulk
+from django.db import connection, transaction
+from django.db.models import F
 
-from core.rag.chunking import chunk_document
+from core.rag.chunking import chunk_document, iter_chunk_document
 from core.rag.pipeline import RAGPipeline
 from core.vectorstore.qdrant_client import QdrantManager
 
-from .models import Document, DocumentChunk
+from .models import Collection, Document, DocumentChunk
 
 logger = logging.getLogger(__name__)
 
 
+def _pg_pipeline():
+    """psycopg3 pipeline context, or a no-op on backends without one.
+
+    Inside a pipeline the statements of a multi-update transaction are sent
+    in a single network round-trip instead of one per statement.
+    """
+    pipeline = getattr(connection.connection, "pipeline", None)
+    return pipeline() if pipeline is not None else nullcontext()
+
+
+def _content_tokens(content: str) -> list[str]:
+    """Unique lowercase tokens, precomputed so the reranker never re-tokenizes."""
+    return sorted(set(content.lower().split()))
+
+
+# Chunks embedded and upserted per batch — bounds peak memory to one batch of
+# vectors instead of n_chunks * dim floats for the whole document.
+EMBED_BATCH_SIZE = 64
+
+
 class DocumentProcessor:
     """Handles end-to-end document processing: parse → chunk → embed → store."""
 
@@ -27,51 +51,52 @@ class DocumentProcessor:
         start_time = time.time()
 
         try:
+            # 1. The upload view hashes the file as it streams in; only
+            # re-hash documents created through other paths.
+            content_hash = document.content_hash or self._compute_hash(document)
             document.status = Document.Status.PROCESSING
-            document.save(update_fields=["status"])
-
-            # 1. Compute content hash for deduplication
-            content_hash = self._compute_hash(document)
             document.content_hash = content_hash
-            document.save(update_fields=["content_hash"])
-
-            # 2. Load and parse document
-            raw_text = self.rag_pipeline.load_document(document.file.path, document.file_type)
-
-            # 3. Chunk document
-            chunks = chunk_document(raw_text, document.metadata)
+            Document.objects.filter(pk=document.pk).update(
+                status=Document.Status.PROCESSING, content_hash=content_hash
+            )
 
-            # 4. Generate embeddings
-            texts = [c["content"] for c in chunks]
-            embeddings = self.rag_pipeline.embed_texts(texts)
+            # 2. Duplicate of an already-indexed document? Clone its chunks
+            # and skip parsing and embedding entirely.
+            if self._clone_duplicate(document, content_hash, start_time):
+                return
 
-            # 5. Store in Qdrant and Postgres
-            self._store_chunks(document, chunks, embeddings)
+            # 3-5. Stream parse → chunk → embed in fixed-size windows, so
+            # peak memory is one window of chunks and vectors regardless of
+            # document size.
+            sections = self.rag_pipeline.iter_document_sections(
+                document.file.path, document.file_type
+            )
+            chunk_count = self._store_chunk_stream(
+                document, iter_chunk_document(sections, document.metadata)
+            )
 
             # 6. Update document and collection stats
             elapsed = time.time() - start_time
-            with transaction.atomic():
-                document.status = Document.Status.COMPLETED
-                document.chunk_count = len(chunks)
-                document.processing_time_seconds = round(elapsed, 2)
-                document.save(
-                    update_fields=["status", "chunk_count", "processing_time_seconds"]
+            with transaction.atomic(), _pg_pipeline():
+                Document.objects.filter(pk=document.pk).update(
+                    status=Document.Status.COMPLETED,
+                    chunk_count=chunk_count,
+                    processing_time_seconds=round(elapsed, 2),
                 )
 
-                collection = document.collection
-                collection.document_count = collection.documents.filter(
-                    status=Document.Status.COMPLETED
-                ).count()
-                collection.total_chunks = DocumentChunk.objects.filter(
-                    document__collection=collection
-                ).count()
-                collection.save(update_fields=["document_count", "total_chunks"])
+                # Incremental one-row update instead of recounting the whole
+                # collection; the periodic update_collection_stats task runs
+                # the authoritative COUNTs and heals any drift.
+                Collection.objects.filter(pk=document.collection_id).update(
+                    document_count=F("document_count") + 1,
+                    total_chunks=F("total_chunks") + chunk_count,
+                )
 
             logger.info(
                 "Document processed",
                 extra={
                     "document_id": str(document.id),
-                    "chunks": len(chunks),
+                    "chunks": chunk_count,
                     "time_seconds": round(elapsed, 2),
                 },
             )
@@ -83,46 +108,242 @@ class DocumentProcessor:
             logger.exception("Document processing failed", extra={"document_id": str(document.id)})
             raise
 
+    def _clone_duplicate(self, document: Document, content_hash: str, start_time: float) -> bool:
+        """Short-circuit processing when an identical file is already indexed.
+
+        Re-uploads of the same file into the same collection would otherwise
+        be parsed and embedded from scratch. The vectors are already in
+        Qdrant, so we copy them under fresh point ids carrying the new
+        document's id — no re-embedding, and deleting either document later
+        cannot strand the other — then clone the chunk rows and mark the
+        document completed.
+        """
+        original = (
+            Document.objects.filter(
+                collection_id=document.collection_id,
+                content_hash=content_hash,
+                status=Document.Status.COMPLETED,
+            )
+            .exclude(pk=document.pk)
+            .only("id")
+            .first()
+        )
+        if original is None:
+            return False
+
+        source_chunks = list(
+            DocumentChunk.objects.filter(document=original).iterator(chunk_size=2000)
+        )
+        point_map = self.qdrant.copy_points(
+            str(document.collection_id),
+            [chunk.qdrant_point_id for chunk in source_chunks],
+            {"document_id": str(document.id)},
+        )
+        clones = [
+            DocumentChunk(
+                document=document,
+                collection_id=document.collection_id,
+                chunk_index=chunk.chunk_index,
+                content=chunk.content,
+                token_count=chunk.token_count,
+                qdrant_point_id=point_map.get(chunk.qdrant_point_id, chunk.qdrant_point_id),
+                metadata=chunk.metadata,
+            )
+            for chunk in source_chunks
+        ]
+
+        elapsed = time.time() - start_time
+        with transaction.atomic():
+            pgbulk.copy(DocumentChunk, clones)
+            Document.objects.filter(pk=document.pk).update(
+                status=Document.Status.COMPLETED,
+                chunk_count=len(clones),
+                processing_time_seconds=round(elapsed, 2),
+            )
+            Collection.objects.filter(pk=document.collection_id).update(
+                document_count=F("document_count") + 1,
+                total_chunks=F("total_chunks") + len(clones),
+            )
+
+        logger.info(
+            "Document deduplicated against existing upload",
+            extra={
+                "document_id": str(document.id),
+                "original_id": str(original.id),
+                "chunks": len(clones),
+            },
+        )
+        return True
+
     def _compute_hash(self, document: Document) -> str:
-        sha256 = hashlib.sha256()
+        # file_digest hashes in C with a large reusable buffer, avoiding a
+        # Python-level update() round-trip per 8 KiB block.
         with document.file.open("rb") as f:
-            for block in iter(lambda: f.read(8192), b""):
-                sha256.update(block)
-        return sha256.hexdigest()
+            digest = hashlib.file_digest(
+                f, lambda: blake3.blake3(max_threads=blake3.blake3.AUTO)
+            )
+        return digest.hexdigest()
+
+    def process_batch(self, document_ids: list[str]) -> None:
+        """Re-process a group of documents, batching embeddings across them.
+
+        Small documents produce fragmentary embedding batches when handled
+        one at a time; flattening chunks across the group keeps every
+        embedding call at full batch width. All documents must belong to the
+        same collection (the re-index fan-out guarantees this).
+        """
+        documents = Document.objects.select_related("collection").filter(id__in=document_ids)
 
-    def _store_chunks(
+        parsed: list[tuple[Document, list[dict]]] = []
+        for document in documents:
+            try:
+                content_hash = document.content_hash or self._compute_hash(document)
+                Document.objects.filter(pk=document.pk).update(
+                    status=Document.Status.PROCESSING, content_hash=content_hash
+                )
+                raw_text = self.rag_pipeline.load_document(
+                    document.file.path, document.file_type
+                )
+                parsed.append((document, chunk_document(raw_text, document.metadata)))
+            except Exception as e:
+                Document.objects.filter(pk=document.pk).update(
+                    status=Document.Status.FAILED, error_message=str(e)[:2000]
+                )
+                logger.exception(
+                    "Document re-processing failed", extra={"document_id": str(document.id)}
+                )
+
+        if not parsed:
+            return
+
+        # Drop the stale chunks and vectors before re-inserting
+        collection_name = str(parsed[0][0].collection_id)
+        DocumentChunk.objects.filter(document__in=[d for d, _ in parsed]).delete()
+        for document, _ in parsed:
+            self.qdrant.delete_by_document(collection_name, str(document.id))
+
+        # Flatten chunks across documents so embedding batches stay full
+        flat = [(document, chunk) for document, chunks in parsed for chunk in chunks]
+        base_payloads = {
+            document.pk: {"document_id": str(document.id), "collection_id": collection_name}
+            for document, _ in parsed
+        }
+        chunk_objects = []
+        for i in range(0, len(flat), EMBED_BATCH_SIZE):
+            batch = flat[i : i + EMBED_BATCH_SIZE]
+            embeddings = self.rag_pipeline.embed_texts([c["content"] for _, c in batch])
+
+            if i == 0:
+                self.qdrant.ensure_collection(collection_name, len(embeddings[0]))
+
+            point_ids = self.qdrant.upsert_vectors(
+                collection_name=collection_name,
+                embeddings=embeddings,
+                payloads=[
+                    {
+                        **base_payloads[document.pk],
+                        "chunk_index": chunk["chunk_index"],
+                        "content": chunk["content"],
+                        "content_tokens": _content_tokens(chunk["content"]),
+                        **(chunk.get("metadata") or {}),
+                    }
+                    for document, chunk in batch
+                ],
+            )
+            chunk_objects.extend(
+                DocumentChunk(
+                    document=document,
+                    collection_id=document.collection_id,
+                    chunk_index=chunk["chunk_index"],
+                    content=chunk["content"],
+                    token_count=chunk.get("token_count", 0),
+                    qdrant_point_id=point_ids[j],
+                    metadata=chunk.get("metadata", {}),
+                )
+                for j, (document, chunk) in enumerate(batch)
+            )
+
+        pgbulk.copy(DocumentChunk, chunk_objects)
+
+        for document, chunks in parsed:
+            document.status = Document.Status.COMPLETED
+            document.chunk_count = len(chunks)
+        Document.objects.bulk_update(
+            [document for document, _ in parsed], ["status", "chunk_count"]
+        )
+
+        logger.info(
+            "Batch re-processed %d documents (%d chunks)", len(parsed), len(flat)
+        )
+
+    def _store_chunk_stream(self, document: Document, chunks) -> int:
+        """Embed, upsert, and COPY chunks window by window as they stream in.
+
+        Each window of EMBED_BATCH_SIZE chunks is embedded, upserted, and
+        written to Postgres, then dropped — the document is never fully
+        resident. Returns the total chunk count.
+        """
+        collection_name = str(document.collection_id)
+        total = 0
+        window: list[dict] = []
+
+        for chunk in chunks:
+            window.append(chunk)
+            if len(window) >= EMBED_BATCH_SIZE:
+                self._flush_window(document, collection_name, window, first=total == 0)
+                total += len(window)
+                window = []
+
+        if window:
+            self._flush_window(document, collection_name, window, first=total == 0)
+            total += len(window)
+
+        return total
+
+    def _flush_window(
         self,
         document: Document,
-        chunks: list[dict],
-        embeddings: list[list[float]],
+        collection_name: str,
+        window: list[dict],
+        first: bool,
     ) -> None:
-        collection_name = str(document.collection.id)
-        self.qdrant.ensure_collection(collection_name, len(embeddings[0]))
+        embeddings = self.rag_pipeline.embed_texts([c["content"] for c in window])
+
+        if first:
+            self.qdrant.ensure_collection(collection_name, len(embeddings[0]))
 
+        # Document-level fields are identical for every chunk — build them
+        # once and spread, instead of re-stringifying UUIDs per payload.
+        base_payload = {"document_id": str(document.id), "collection_id": collection_name}
         point_ids = self.qdrant.upsert_vectors(
             collection_name=collection_name,
             embeddings=embeddings,
             payloads=[
                 {
-                    "document_id": str(document.id),
-                    "collection_id": str(document.collection.id),
+                    **base_payload,
                     "chunk_index": chunk["chunk_index"],
                     "content": chunk["content"],
-                    **chunk.get("metadata", {}),
+                    "content_tokens": _content_tokens(chunk["content"]),
+                    **(chunk.get("metadata") or {}),
                 }
-                for chunk in chunks
+                for chunk in window
             ],
         )
 
-        chunk_objects = [
-            DocumentChunk(
-                document=document,
-                chunk_index=chunk["chunk_index"],
-                content=chunk["content"],
-                token_count=chunk.get("token_count", 0),
-                qdrant_point_id=point_ids[i],
-                metadata=chunk.get("metadata", {}),
-            )
-            for i, chunk in enumerate(chunks)
-        ]
-        DocumentChunk.objects.bulk_create(chunk_objects)
+        # COPY streams the rows through Postgres' bulk protocol — far cheaper
+        # than multi-row INSERTs for documents with thousands of chunks.
+        pgbulk.copy(
+            DocumentChunk,
+            [
+                DocumentChunk(
+                    document=document,
+                    collection_id=document.collection_id,
+                    chunk_index=chunk["chunk_index"],
+                    content=chunk["content"],
+                    token_count=chunk.get("token_count", 0),
+                    qdrant_point_id=point_ids[j],
+                    metadata=chunk.get("metadata", {}),
+                )
+                for j, chunk in enumerate(window)
+            ],
+        )
@@ -3,10 +3,38 @@
 import logging
 
 from celery import shared_task
+from celery.signals import worker_process_init
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# One DocumentProcessor per worker process: its RAG pipeline and Qdrant
+# client hold warm HTTP connections and model handles that are expensive
+# to rebuild per task.
+_PROCESSOR = None
+
+
+def _get_processor():
+    global _PROCESSOR
+    if _PROCESSOR is None:
+        from .services import DocumentProcessor
+
+        _PROCESSOR = DocumentProcessor()
+    return _PROCESSOR
+
+
+@worker_process_init.connect
+def _init_processor(**kwargs):
+    """Warm the processor at fork time instead of on the first task."""
+    _get_processor()
+
+# Documents re-indexed per batch task — large enough to fill embedding
+# batches across small documents, small enough to keep tasks short.
+REINDEX_GROUP_SIZE = 32
+
+# Expired documents deleted per transaction during retention cleanup.
+CLEANUP_BATCH_SIZE = 1000
+
 
 @shared_task(
     bind=True,
@@ -16,11 +44,8 @@ logger = logging.getLogger(__name__)
 )
 def process_document_task(self, document_id: str) -> dict:
     """Process a document asynchronously: parse, chunk, embed, store."""
-    from .services import DocumentProcessor
-
     try:
-        processor = DocumentProcessor()
-        processor.process(document_id)
+        _get_processor().process(document_id)
         return {"status": "completed", "document_id": document_id}
     except Exception as exc:
         logger.exception("Document processing task failed", extra={"document_id": document_id})
@@ -29,31 +54,75 @@ def process_document_task(self, document_id: str) -> dict:
 
 @shared_task
 def cleanup_expired_documents() -> dict:
-    """Remove documents older than retention period."""
+    """Remove documents older than retention period.
+
+    Deletes in batches of CLEANUP_BATCH_SIZE so each transaction stays
+    short — one monolithic cascade over months of expired documents holds
+    locks and inflates replication lag. Vectors are dropped from Qdrant
+    per batch; previously they were orphaned on cleanup.
+    """
+    from core.vectorstore.qdrant_client import QdrantManager
+
     from .models import Document
 
+    qdrant = QdrantManager()
     cutoff = timezone.now() - timezone.timedelta(days=90)
-    expired = Document.objects.filter(
-        created_at__lt=cutoff,
-        collection__metadata__auto_cleanup=True,
-    )
-    count = expired.count()
-    expired.delete()
+    deleted = 0
+
+    while True:
+        batch = list(
+            Document.objects.filter(
+                created_at__lt=cutoff,
+                collection__metadata__auto_cleanup=True,
+            ).values_list("id", "collection_id")[:CLEANUP_BATCH_SIZE]
+        )
+        if not batch:
+            break
 
-    logger.info("Cleaned up %d expired documents", count)
-    return {"deleted": count}
+        for doc_id, collection_id in batch:
+            try:
+                qdrant.delete_by_document(str(collection_id), str(doc_id))
+            except Exception:
+                logger.warning(
+                    "Failed to delete vectors for expired document %s", doc_id
+                )
+
+        Document.objects.filter(id__in=[doc_id for doc_id, _ in batch]).delete()
+        deleted += len(batch)
+
+    logger.info("Cleaned up %d expired documents", deleted)
+    return {"deleted": deleted}
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    acks_late=True,
+)
+def process_document_batch_task(self, document_ids: list[str]) -> dict:
+    """Re-process a group of documents with embedding batched across them."""
+    try:
+        _get_processor().process_batch(document_ids)
+        return {"status": "completed", "documents": len(document_ids)}
+    except Exception as exc:
+        logger.exception("Batch processing task failed")
+        raise self.retry(exc=exc)
 
 
 @shared_task(bind=True, max_retries=2)
 def reindex_collection_task(self, collection_id: str) -> dict:
-    """Re-process all documents in a collection."""
+    """Re-process all documents in a collection in embedding-friendly groups."""
     from .models import Document
 
-    documents = Document.objects.filter(
-        collection_id=collection_id,
-        status=Document.Status.COMPLETED,
+    document_ids = list(
+        Document.objects.filter(
+            collection_id=collection_id,
+            status=Document.Status.COMPLETED,
+        ).values_list("id", flat=True)
     )
-    for doc in documents:
-        process_document_task.delay(str(doc.id))
+    for i in range(0, len(document_ids), REINDEX_GROUP_SIZE):
+        group = document_ids[i : i + REINDEX_GROUP_SIZE]
+        process_document_batch_task.delay([str(doc_id) for doc_id in group])
 
-    return {"collection_id": collection_id, "reindexed": documents.count()}
+    return {"collection_id": collection_id, "reindexed": len(document_ids)}
@@ -1,5 +1,6 @@
 """Document and collection API views."""
 
+import blake3
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
@@ -9,6 +10,7 @@ from .models import Collection, Document, DocumentChunk
 from .serializers import (
     CollectionSerializer,
     DocumentChunkSerializer,
+    DocumentListSerializer,
     DocumentSerializer,
     DocumentUploadSerializer,
 )
@@ -46,12 +48,14 @@ class CollectionDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 class DocumentListView(generics.ListAPIView):
-    serializer_class = DocumentSerializer
+    serializer_class = DocumentListSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["status", "collection"]
 
     def get_queryset(self):
-        return Document.objects.filter(collection__owner=self.request.user)
+        return Document.objects.filter(collection__owner=self.request.user).only(
+            "id", "collection_id", "title", "file_type", "status", "chunk_count", "created_at"
+        )
 
 
 class DocumentDetailView(generics.RetrieveDestroyAPIView):
@@ -70,14 +74,21 @@ def upload_document(request):
     serializer.is_valid(raise_exception=True)
 
     uploaded_file = serializer.validated_data["file"]
-    collection = Collection.objects.get(id=serializer.validated_data["collection_id"])
+    collection = serializer.collection  # fetched (and cached) during validation
+
+    # Hash while the upload is still in memory/temp storage — the worker
+    # then skips a full re-read of the file just to fingerprint it.
+    hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
 
     document = Document.objects.create(
         collection=collection,
         title=serializer.validated_data.get("title", uploaded_file.name),
         file=uploaded_file,
-        file_type=uploaded_file.name.rsplit(".", 1)[-1].lower(),
+        file_type=serializer.file_type,  # computed once during validation
         file_size_bytes=uploaded_file.size,
+        content_hash=hasher.hexdigest(),
         metadata=serializer.validated_data.get("metadata", {}),
     )
 
@@ -112,4 +123,4 @@ class DocumentChunkListView(generics.ListAPIView):
         return DocumentChunk.objects.filter(
             document_id=self.kwargs["document_id"],
             document__collection__owner=self.request.user,
-        )
+        ).only("id", "chunk_index", "content", "token_count", "metadata")
@@ -157,6 +157,7 @@ AUTH_PASSWORD_VALIDATORS = [
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.APIKeyAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_FILTER_BACKENDS": (
@@ -206,6 +207,19 @@ CELERY_TASK_TIME_LIMIT = 600
 CELERY_TASK_SOFT_TIME_LIMIT = 540
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# Fair scheduling: with long-running ingestion tasks, prefetching batches of
+# messages lets one worker hoard work while others sit idle. Prefetch one
+# message at a time and keep late-ack semantics safe on failure/timeout.
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_ACKS_ON_FAILURE_OR_TIMEOUT = True
+
+# Route heavy ingestion work to a dedicated queue so quick housekeeping
+# tasks are never stuck behind multi-minute document processing.
+CELERY_TASK_ROUTES = {
+    "apps.documents.tasks.process_document_task": {"queue": "ingest"},
+    "apps.documents.tasks.process_document_batch_task": {"queue": "ingest"},
+}
+
 # ---------------------------------------------------------------------------
 # DRF Spectacular (OpenAPI)
 # ---------------------------------------------------------------------------
@@ -250,16 +264,33 @@ QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
 QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", "")
 QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "documind_documents")
+# gRPC channel pool — the client default of 3 connections throttles
+# concurrent search/upsert workloads
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "100"))
+
+# Minimum cosine similarity for a semantic-cache hit on paraphrased queries
+SEMCACHE_THRESHOLD = float(os.getenv("SEMCACHE_THRESHOLD", "0.90"))
 
 # ---------------------------------------------------------------------------
 # Document processing
 # ---------------------------------------------------------------------------
 
 MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
-SUPPORTED_FILE_TYPES = ["pdf", "txt", "md", "docx", "csv", "json", "html"]
+SUPPORTED_FILE_TYPES = frozenset({"pdf", "txt", "md", "docx", "csv", "json", "html"})
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
 
+# Embedding API calls: texts per request and in-flight request cap
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "256"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+
+# ---------------------------------------------------------------------------
+# Chat
+# ---------------------------------------------------------------------------
+
+# Max messages of history loaded per chat turn
+CHAT_HISTORY_WINDOW = int(os.getenv("CHAT_HISTORY_WINDOW", "50"))
+
 # ---------------------------------------------------------------------------
 # File storage
 # ---------------------------------------------------------------------------
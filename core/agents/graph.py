@@ -2,57 +2,164 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import time
 from typing import Any, AsyncIterator
 
+import orjson
+from django_redis import get_redis_connection
 from langchain_core.messages import HumanMessage
-from langgraph.graph import END, StateGraph
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END, START, StateGraph
+
+from core.llm.factory import LLMFactory
 
 from .nodes import (
+    aanalyse_agent,
     analyse_agent,
+    aqa_agent,
+    aresearch_agent,
+    aretrieve_documents,
+    aroute_query,
+    asummarise_agent,
     qa_agent,
     research_agent,
     retrieve_documents,
     route_query,
     summarise_agent,
 )
+from .semantic_cache import SemanticCache
 from .state import AgentState
 
 logger = logging.getLogger(__name__)
 
+_semantic_cache = SemanticCache()
+
+
+def _embed_query_safe(query: str) -> list[float] | None:
+    """Embed the query for cache lookup; the cache must never fail a request."""
+    try:
+        return LLMFactory.get_embeddings().embed_query(query)
+    except Exception:
+        logger.warning("Semantic cache embedding failed", exc_info=True)
+        return None
+
+
+# Seconds a coalescing leader holds the in-flight slot (and the longest a
+# duplicate request will wait on the leader's stream).
+_INFLIGHT_TTL = 60
+
+
+def _coalesce_channel(query: str, collection_id: str | None, agent_mode: str) -> str:
+    digest = hashlib.sha256(
+        orjson.dumps([query, collection_id or "", agent_mode])
+    ).hexdigest()
+    return f"llmstream:{digest}"
+
+
+async def _relay_stream(redis, channel: str) -> AsyncIterator[dict[str, Any]]:
+    """Relay a leader's published stream to this caller.
+
+    Subscribing can race the leader's first tokens; if the first event seen
+    is not seq 0 the partial stream is discarded and everything is replayed
+    from the leader's final message. The final frame also backfills the
+    answer when the live stream carried no token frames at all — a leader
+    serving a response-cache hit (or a non-streaming model) publishes only
+    sources + final.
+    """
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    try:
+        await asyncio.to_thread(pubsub.subscribe, channel)
+        complete = True
+        first = True
+        tokens_relayed = False
+        leader_gone = False
+        deadline = time.monotonic() + _INFLIGHT_TTL
+        while time.monotonic() < deadline:
+            message = await asyncio.to_thread(pubsub.get_message, timeout=1.0)
+            if message is None:
+                # A subscriber that arrived after the leader's final publish
+                # would otherwise poll out the full TTL. When the inflight
+                # key is gone the leader has finished (or died); allow one
+                # more poll for an in-flight final frame, then give up so
+                # the caller falls through and runs the graph itself.
+                if leader_gone:
+                    return
+                try:
+                    leader_gone = not await asyncio.to_thread(
+                        redis.exists, f"inflight:{channel}"
+                    )
+                except Exception:
+                    pass
+                continue
+            event = orjson.loads(message["data"])
+            seq = event.pop("seq", 0)
+            if first:
+                complete = seq == 0
+                first = False
+            if event.get("type") == "abort":
+                # Leader failed mid-run; stop relaying. A caller that has
+                # seen nothing yet falls through and runs the graph itself.
+                return
+            if event.get("type") == "final":
+                if not complete and event.get("sources"):
+                    yield {"type": "sources", "sources": event["sources"]}
+                if not tokens_relayed:
+                    answer = event.get("answer", "")
+                    for i in range(0, len(answer), 20):
+                        yield {"type": "token", "content": answer[i : i + 20]}
+                yield {"type": "metadata", "model": event.get("model", "")}
+                return
+            if complete:
+                if event.get("type") == "token":
+                    tokens_relayed = True
+                yield event
+    finally:
+        await asyncio.to_thread(pubsub.close)
+
+
+def _join(state: AgentState) -> dict:
+    """Barrier node — waits for router and retriever before branching."""
+    return {}
+
 
 def _build_graph() -> StateGraph:
     """
-    Build the LangGraph agent workflow:
-
-    ┌──────────┐    ┌───────────┐    ┌──────────┐
-    │  Router  │───▶│ Retriever │───▶│  Agent   │───▶ END
-    └──────────┘    └───────────┘    │ (branch) │
-                                     └──────────┘
-                                     ┌─ qa_agent
-                                     ├─ research_agent
-                                     ├─ summarise_agent
-                                     └─ analyse_agent
+    Build the LangGraph agent workflow. Router and retriever are independent
+    I/O operations, so they fan out from START and run concurrently:
+
+    ┌──────────┐
+    │  Router  │──┐   ┌──────┐    ┌──────────┐
+    └──────────┘  ├──▶│ Join │───▶│  Agent   │───▶ END
+    ┌───────────┐ │   └──────┘    │ (branch) │
+    │ Retriever │─┘               └──────────┘
+    └───────────┘                 ┌─ qa_agent
+                                  ├─ research_agent
+                                  ├─ summarise_agent
+                                  └─ analyse_agent
     """
     graph = StateGraph(AgentState)
 
-    # Add nodes
-    graph.add_node("router", route_query)
-    graph.add_node("retriever", retrieve_documents)
-    graph.add_node("qa", qa_agent)
-    graph.add_node("research", research_agent)
-    graph.add_node("summarise", summarise_agent)
-    graph.add_node("analyse", analyse_agent)
-
-    # Entry point
-    graph.set_entry_point("router")
+    # Router and retriever carry both sync and async implementations so the
+    # streaming path overlaps their network round-trips with asyncio.
+    graph.add_node("router", RunnableLambda(route_query, afunc=aroute_query))
+    graph.add_node("retriever", RunnableLambda(retrieve_documents, afunc=aretrieve_documents))
+    graph.add_node("join", _join)
+    graph.add_node("qa", RunnableLambda(qa_agent, afunc=aqa_agent))
+    graph.add_node("research", RunnableLambda(research_agent, afunc=aresearch_agent))
+    graph.add_node("summarise", RunnableLambda(summarise_agent, afunc=asummarise_agent))
+    graph.add_node("analyse", RunnableLambda(analyse_agent, afunc=aanalyse_agent))
 
-    # Router → Retriever
-    graph.add_edge("router", "retriever")
+    # Parallel fan-out, then barrier
+    graph.add_edge(START, "router")
+    graph.add_edge(START, "retriever")
+    graph.add_edge(["router", "retriever"], "join")
 
-    # Retriever → conditional branch to specialist agent
+    # Join → conditional branch to specialist agent
     graph.add_conditional_edges(
-        "retriever",
+        "join",
         lambda state: state["next_node"],
         {
             "qa": "qa",
@@ -81,14 +188,28 @@ def run_agent_graph(
     collection_id: str | None,
     agent_mode: str = "qa",
     user_id: str = "",
+    prev_retrieved_ids: list[str] | None = None,
 ) -> dict[str, Any]:
     """Run the agent graph synchronously and return the result."""
+    # Paraphrase-tolerant cache: one embedding + one vector lookup instead
+    # of router LLM + retrieval + agent LLM. Keyed only on the query
+    # embedding, so it applies to history-free turns alone — a follow-up
+    # answer is conditioned on one conversation's history and must not be
+    # served to (or stored for) anyone else.
+    q_vec = _embed_query_safe(query)
+    if q_vec is not None and not history:
+        cached = _semantic_cache.lookup(q_vec, collection_id)
+        if cached is not None:
+            return cached
+
     initial_state: AgentState = {
         "messages": [HumanMessage(content=query)],
         "query": query,
         "history": history,
         "agent_mode": agent_mode,
         "collection_id": collection_id,
+        "query_embedding": q_vec,
+        "prev_retrieved_ids": prev_retrieved_ids or [],
         "user_id": user_id,
         "retrieved_documents": [],
         "answer": "",
@@ -99,12 +220,15 @@ def run_agent_graph(
 
     result = _compiled_graph.invoke(initial_state)
 
-    return {
+    payload = {
         "answer": result["answer"],
         "sources": result["sources"],
         "model": result.get("metadata", {}).get("model", ""),
         "metadata": result.get("metadata", {}),
     }
+    if q_vec is not None and not history:
+        _semantic_cache.store(q_vec, query, collection_id, payload)
+    return payload
 
 
 async def astream_agent_graph(
@@ -113,9 +237,65 @@ async def astream_agent_graph(
     collection_id: str | None,
     agent_mode: str = "qa",
     user_id: str = "",
+    prev_retrieved_ids: list[str] | None = None,
 ) -> AsyncIterator[dict[str, Any]]:
     """Stream the agent graph execution for WebSocket consumers."""
-    from core.llm.factory import LLMFactory
+    # Semantic cache first — a hit replays the stored answer in the same
+    # event shapes the live path produces. History-conditioned turns bypass
+    # the cache entirely (the key carries no history, so a follow-up answer
+    # stored here would leak into other conversations).
+    q_vec = await asyncio.to_thread(_embed_query_safe, query)
+    if q_vec is not None and not history:
+        cached = await asyncio.to_thread(_semantic_cache.lookup, q_vec, collection_id)
+        if cached is not None:
+            if cached["sources"]:
+                yield {"type": "sources", "sources": cached["sources"]}
+            answer = cached["answer"]
+            chunk_size = 20
+            for i in range(0, len(answer), chunk_size):
+                yield {"type": "token", "content": answer[i : i + chunk_size]}
+            yield {"type": "metadata", "model": cached["model"]}
+            return
+
+    # Request coalescing: concurrent identical requests (same query,
+    # collection, and mode) collapse into one graph run. The first caller
+    # wins an NX lock and publishes its stream; duplicates subscribe and
+    # relay instead of paying for their own retrieval and generation. Only
+    # history-free requests coalesce — the channel digest carries no
+    # history, and a follow-up answer conditioned on one conversation must
+    # never be relayed to another.
+    channel = _coalesce_channel(query, collection_id, agent_mode)
+    redis, leader = None, True
+    if not history:
+        try:
+            redis = get_redis_connection("default")
+            leader = bool(redis.set(f"inflight:{channel}", "1", nx=True, ex=_INFLIGHT_TTL))
+        except Exception:
+            redis, leader = None, True
+
+    if redis is not None and not leader:
+        relayed = False
+        async for event in _relay_stream(redis, channel):
+            relayed = True
+            yield event
+        if relayed:
+            return
+        # The leader finished (or died) before we heard anything — fall
+        # through and run the graph ourselves; its caches make that cheap.
+
+    seq = 0
+
+    async def _publish(event: dict) -> None:
+        nonlocal seq
+        if redis is None or not leader:
+            return
+        try:
+            await asyncio.to_thread(
+                redis.publish, channel, orjson.dumps({"seq": seq, **event})
+            )
+        except Exception:
+            logger.debug("Coalesce publish failed", exc_info=True)
+        seq += 1
 
     initial_state: AgentState = {
         "messages": [HumanMessage(content=query)],
@@ -123,6 +303,8 @@ async def astream_agent_graph(
         "history": history,
         "agent_mode": agent_mode,
         "collection_id": collection_id,
+        "query_embedding": q_vec,
+        "prev_retrieved_ids": prev_retrieved_ids or [],
         "user_id": user_id,
         "retrieved_documents": [],
         "answer": "",
@@ -131,21 +313,85 @@ async def astream_agent_graph(
         "metadata": {},
     }
 
-    # Stream through graph nodes
-    async for event in _compiled_graph.astream(initial_state, stream_mode="updates"):
-        for node_name, node_output in event.items():
-            # Emit sources when retriever completes
-            if node_name == "retriever" and node_output.get("sources"):
-                yield {"type": "sources", "sources": node_output["sources"]}
+    # Forward real model tokens as they arrive — TTFT is first-token
+    # latency, not full-generation latency.
+    agent_nodes = ("qa", "research", "summarise", "analyse")
+    final_answer = ""
+    final_sources: list = []
+    final_metadata: dict = {}
+    streamed = False
+    finished = False
+
+    try:
+        async for event in _compiled_graph.astream_events(initial_state, version="v2"):
+            kind = event["event"]
+
+            if kind == "on_chat_model_stream":
+                # Only the specialist agent's tokens go to the client — the
+                # router's structured output stays internal.
+                if event.get("metadata", {}).get("langgraph_node") in agent_nodes:
+                    content = event["data"]["chunk"].content
+                    if content:
+                        streamed = True
+                        yield {"type": "token", "content": content}
+                        await _publish({"type": "token", "content": content})
+
+            elif kind == "on_chain_end":
+                name = event.get("name", "")
+                output = event["data"].get("output") or {}
+                if not isinstance(output, dict):
+                    continue
+                if name == "retriever" and output.get("sources"):
+                    final_sources = output["sources"]
+                    yield {"type": "sources", "sources": final_sources}
+                    await _publish({"type": "sources", "sources": final_sources})
+                elif name in agent_nodes:
+                    final_answer = output.get("answer", "")
+                    final_metadata = output.get("metadata", {})
+
+        # Response-cache hits (and models that don't stream) produce no token
+        # events — replay the finished answer in chunks instead.
+        if not streamed and final_answer:
+            chunk_size = 20
+            for i in range(0, len(final_answer), chunk_size):
+                yield {"type": "token", "content": final_answer[i : i + chunk_size]}
 
-            # Emit the answer token-by-token
-            if node_name in ("qa", "research", "summarise", "analyse"):
-                answer = node_output.get("answer", "")
-                metadata = node_output.get("metadata", {})
+        yield {"type": "metadata", "model": final_metadata.get("model", "")}
 
-                # Simulate streaming by yielding chunks
-                chunk_size = 20
-                for i in range(0, len(answer), chunk_size):
-                    yield {"type": "token", "content": answer[i : i + chunk_size]}
+        # The final frame carries the whole answer so late subscribers that
+        # missed early tokens can still serve a complete response.
+        await _publish(
+            {
+                "type": "final",
+                "answer": final_answer,
+                "sources": final_sources,
+                "model": final_metadata.get("model", ""),
+            }
+        )
+        finished = True
+    finally:
+        # Runs on the happy path, on a graph failure, and when the client
+        # disconnects mid-stream: release the in-flight slot immediately so
+        # duplicate requests don't stall out the full TTL, and tell any
+        # followers to stop waiting for a final frame that will never come.
+        if redis is not None and leader:
+            if not finished:
+                await _publish({"type": "abort"})
+            try:
+                await asyncio.to_thread(redis.delete, f"inflight:{channel}")
+            except Exception:
+                pass
 
-                yield {"type": "metadata", "model": metadata.get("model", "")}
+    if q_vec is not None and final_answer and not history:
+        await asyncio.to_thread(
+            _semantic_cache.store,
+            q_vec,
+            query,
+            collection_id,
+            {
+                "answer": final_answer,
+                "sources": final_sources,
+                "model": final_metadata.get("model", ""),
+                "metadata": final_metadata,
+            },
+        )
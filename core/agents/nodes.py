@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import re
+from functools import lru_cache
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.output_parsers import PydanticOutputParser
 
 from core.llm.factory import LLMFactory
+from core.llm.response_cache import ainvoke_cached, astream_cached, invoke_cached
 from core.rag.retriever import HybridRetriever
+from core.rag.semantic_cache import RandomProjectionLSH
 
 from .state import AgentState, RouteDecision
 
@@ -32,37 +38,92 @@ The user has selected mode: {agent_mode}
 
 Respond with the routing decision."""
 
+# Cheap first-pass classifier: a 4-way label rarely needs an LLM. Queries
+# with an unambiguous intent keyword skip the router round-trip entirely.
+_ROUTE_PATTERNS = {
+    "summarise": re.compile(r"\b(summari[sz]e|tl;?dr|overview)\b", re.IGNORECASE),
+    "analyse": re.compile(r"\b(compare|contrast|analy[sz]e|trend)\b", re.IGNORECASE),
+    "research": re.compile(r"\b(research|comprehensive|in[- ]depth)\b", re.IGNORECASE),
+}
 
-def route_query(state: AgentState) -> AgentState:
-    """Decide which specialist agent should handle the query."""
-    # If user explicitly chose a mode, respect it
-    if state.get("agent_mode") and state["agent_mode"] != "qa":
-        state["next_node"] = state["agent_mode"]
-        state["metadata"] = {**state.get("metadata", {}), "route_reason": "user_selected"}
-        return state
 
-    llm = LLMFactory.get_chat_model(temperature=0)
-    parser = PydanticOutputParser(pydantic_object=RouteDecision)
+@lru_cache(maxsize=1024)
+def _heuristic_route(query: str) -> str | None:
+    matches = [route for route, pattern in _ROUTE_PATTERNS.items() if pattern.search(query)]
+    # Only trust the heuristic when exactly one intent matches
+    return matches[0] if len(matches) == 1 else None
+
 
+def _router_messages(state: AgentState) -> tuple[list, PydanticOutputParser]:
+    parser = PydanticOutputParser(pydantic_object=RouteDecision)
     messages = [
         SystemMessage(content=ROUTER_PROMPT.format(agent_mode=state.get("agent_mode", "qa"))),
         HumanMessage(content=f"Query: {state['query']}\n\n{parser.get_format_instructions()}"),
     ]
+    return messages, parser
+
 
-    response = llm.invoke(messages)
+def _route_update(state: AgentState, parser: PydanticOutputParser, entry: dict) -> dict:
     try:
-        decision = parser.parse(response.content)
-        state["next_node"] = decision.route
-        state["metadata"] = {
-            **state.get("metadata", {}),
-            "route_reason": decision.reasoning,
+        decision = parser.parse(entry["content"])
+        update = {
+            "next_node": decision.route,
+            "metadata": {**state.get("metadata", {}), "route_reason": decision.reasoning},
         }
     except Exception:
-        state["next_node"] = "qa"
-        state["metadata"] = {**state.get("metadata", {}), "route_reason": "fallback"}
+        update = {
+            "next_node": "qa",
+            "metadata": {**state.get("metadata", {}), "route_reason": "fallback"},
+        }
+
+    logger.info("Routed query to: %s", update["next_node"])
+    return update
+
+
+def route_query(state: AgentState) -> dict:
+    """Decide which specialist agent should handle the query."""
+    # If user explicitly chose a mode, respect it
+    if state.get("agent_mode") and state["agent_mode"] != "qa":
+        return {
+            "next_node": state["agent_mode"],
+            "metadata": {**state.get("metadata", {}), "route_reason": "user_selected"},
+        }
+
+    route = _heuristic_route(state["query"].lower())
+    if route is not None:
+        return {
+            "next_node": route,
+            "metadata": {**state.get("metadata", {}), "route_reason": "keyword_match"},
+        }
 
-    logger.info("Routed query to: %s", state["next_node"])
-    return state
+    llm = LLMFactory.get_chat_model(temperature=0)
+    messages, parser = _router_messages(state)
+
+    # temperature=0 makes routing fully deterministic — the highest-hit-rate
+    # consumer of the response cache.
+    entry = invoke_cached(llm, messages, temperature=0)
+    return _route_update(state, parser, entry)
+
+
+async def aroute_query(state: AgentState) -> dict:
+    """Async router — lets the graph overlap routing with retrieval."""
+    if state.get("agent_mode") and state["agent_mode"] != "qa":
+        return {
+            "next_node": state["agent_mode"],
+            "metadata": {**state.get("metadata", {}), "route_reason": "user_selected"},
+        }
+
+    route = _heuristic_route(state["query"].lower())
+    if route is not None:
+        return {
+            "next_node": route,
+            "metadata": {**state.get("metadata", {}), "route_reason": "keyword_match"},
+        }
+
+    llm = LLMFactory.get_chat_model(temperature=0)
+    messages, parser = _router_messages(state)
+    entry = await ainvoke_cached(llm, messages, temperature=0)
+    return _route_update(state, parser, entry)
 
 
 # ---------------------------------------------------------------------------
@@ -70,34 +131,102 @@ def route_query(state: AgentState) -> AgentState:
 # ---------------------------------------------------------------------------
 
 
-def retrieve_documents(state: AgentState) -> AgentState:
-    """Retrieve relevant documents from the vector store."""
-    collection_id = state.get("collection_id")
-    if not collection_id:
-        state["retrieved_documents"] = []
-        return state
-
-    retriever = HybridRetriever(
+def _build_retriever(collection_id: str) -> HybridRetriever:
+    return HybridRetriever(
         collection_id=collection_id,
         top_k=10,
         rerank_top_k=5,
         use_compression=False,
     )
-    docs = retriever.retrieve(state["query"])
-    state["retrieved_documents"] = docs
-
-    state["sources"] = [
-        {
-            "content": doc.page_content[:300],
-            "score": doc.metadata.get("score", 0),
-            "document_id": doc.metadata.get("document_id", ""),
-            "chunk_index": doc.metadata.get("chunk_index", 0),
-        }
-        for doc in docs
-    ]
 
+
+# Paraphrase-tolerant retrieval cache: a hit on a near-duplicate query vector
+# skips search, rerank, and compression entirely.
+_RETRIEVAL_CACHE = RandomProjectionLSH()
+
+
+# Short queries that introduce no new proper nouns ("and in 2023?") almost
+# always refine the previous turn, so its retrieved context still applies.
+_RE_PROPER_NOUN = re.compile(r"\b[A-Z][a-z]+")
+_FOLLOWUP_MAX_WORDS = 8
+
+
+def _is_followup(query: str) -> bool:
+    return len(query.split()) < _FOLLOWUP_MAX_WORDS and not _RE_PROPER_NOUN.search(query[1:])
+
+
+def _reuse_previous(state: AgentState, retriever: HybridRetriever):
+    """Rehydrate the prior turn's documents for follow-up queries, or None."""
+    prev_ids = state.get("prev_retrieved_ids")
+    if not prev_ids or not state.get("history") or not _is_followup(state["query"]):
+        return None
+    try:
+        docs = retriever.retrieve_by_ids(prev_ids)
+    except Exception:
+        logger.warning("Previous-turn rehydration failed; falling back to search")
+        return None
+    if docs:
+        logger.info("Reused %d documents from previous turn", len(docs))
+    return docs or None
+
+
+def _retrieval_update(docs) -> dict:
     logger.info("Retrieved %d documents", len(docs))
-    return state
+    return {
+        "retrieved_documents": docs,
+        "sources": [
+            {
+                "content": doc.page_content[:300],
+                "score": doc.metadata.get("score", 0),
+                "document_id": doc.metadata.get("document_id", ""),
+                "chunk_index": doc.metadata.get("chunk_index", 0),
+                "point_id": doc.metadata.get("point_id", ""),
+            }
+            for doc in docs
+        ],
+    }
+
+
+def retrieve_documents(state: AgentState) -> dict:
+    """Retrieve relevant documents from the vector store."""
+    collection_id = state.get("collection_id")
+    if not collection_id:
+        return {"retrieved_documents": [], "sources": []}
+
+    q_vec = state.get("query_embedding")
+    if q_vec is not None:
+        cached = _RETRIEVAL_CACHE.lookup(q_vec, collection_id)
+        if cached is not None:
+            return _retrieval_update(cached)
+
+    retriever = _build_retriever(collection_id)
+    docs = _reuse_previous(state, retriever)
+    if docs is None:
+        docs = retriever.retrieve(state["query"], query_vector=q_vec)
+        if q_vec is not None:
+            _RETRIEVAL_CACHE.store(q_vec, collection_id, docs)
+    return _retrieval_update(docs)
+
+
+async def aretrieve_documents(state: AgentState) -> dict:
+    """Async retrieval — runs concurrently with the router node."""
+    collection_id = state.get("collection_id")
+    if not collection_id:
+        return {"retrieved_documents": [], "sources": []}
+
+    q_vec = state.get("query_embedding")
+    if q_vec is not None:
+        cached = await asyncio.to_thread(_RETRIEVAL_CACHE.lookup, q_vec, collection_id)
+        if cached is not None:
+            return _retrieval_update(cached)
+
+    retriever = _build_retriever(collection_id)
+    docs = await asyncio.to_thread(_reuse_previous, state, retriever)
+    if docs is None:
+        docs = await retriever.aretrieve(state["query"], query_vector=q_vec)
+        if q_vec is not None:
+            await asyncio.to_thread(_RETRIEVAL_CACHE.store, q_vec, collection_id, docs)
+    return _retrieval_update(docs)
 
 
 # ---------------------------------------------------------------------------
@@ -113,21 +242,17 @@ Context:
 {context}"""
 
 
-def qa_agent(state: AgentState) -> AgentState:
-    """Direct Q&A from retrieved documents."""
-    context = _format_context(state["retrieved_documents"])
-    llm = LLMFactory.get_chat_model(temperature=0.1)
+def _static_prefix(prompt: str) -> SystemMessage:
+    """Build the instruction-only prefix of an agent prompt at import time.
 
-    messages = _build_messages(QA_SYSTEM_PROMPT.format(context=context), state)
-    response = llm.invoke(messages)
+    Keeping the per-query context out of the first message makes the leading
+    bytes of every request identical, so providers with prompt caching can
+    reuse the cached prefix instead of reprocessing the instructions.
+    """
+    return SystemMessage(content=prompt.split("Context:")[0].rstrip() + "\n\nContext:")
 
-    state["answer"] = response.content
-    state["metadata"] = {
-        **state.get("metadata", {}),
-        "agent": "qa",
-        "model": getattr(llm, "model_name", str(type(llm).__name__)),
-    }
-    return state
+
+_QA_PREFIX = _static_prefix(QA_SYSTEM_PROMPT)
 
 
 RESEARCH_SYSTEM_PROMPT = """You are a thorough research analyst.
@@ -138,22 +263,7 @@ Identify patterns, contradictions, and gaps in the available information.
 Context:
 {context}"""
 
-
-def research_agent(state: AgentState) -> AgentState:
-    """Deep research across multiple documents."""
-    context = _format_context(state["retrieved_documents"])
-    llm = LLMFactory.get_chat_model(temperature=0.2, max_tokens=8192)
-
-    messages = _build_messages(RESEARCH_SYSTEM_PROMPT.format(context=context), state)
-    response = llm.invoke(messages)
-
-    state["answer"] = response.content
-    state["metadata"] = {
-        **state.get("metadata", {}),
-        "agent": "research",
-        "model": getattr(llm, "model_name", str(type(llm).__name__)),
-    }
-    return state
+_RESEARCH_PREFIX = _static_prefix(RESEARCH_SYSTEM_PROMPT)
 
 
 SUMMARISE_SYSTEM_PROMPT = """You are an expert summariser.
@@ -164,22 +274,7 @@ Include section headers for different topics.
 Context:
 {context}"""
 
-
-def summarise_agent(state: AgentState) -> AgentState:
-    """Summarise documents or sections."""
-    context = _format_context(state["retrieved_documents"])
-    llm = LLMFactory.get_chat_model(temperature=0.1, max_tokens=4096)
-
-    messages = _build_messages(SUMMARISE_SYSTEM_PROMPT.format(context=context), state)
-    response = llm.invoke(messages)
-
-    state["answer"] = response.content
-    state["metadata"] = {
-        **state.get("metadata", {}),
-        "agent": "summarise",
-        "model": getattr(llm, "model_name", str(type(llm).__name__)),
-    }
-    return state
+_SUMMARISE_PREFIX = _static_prefix(SUMMARISE_SYSTEM_PROMPT)
 
 
 ANALYSE_SYSTEM_PROMPT = """You are a data analyst specialising in document analysis.
@@ -190,22 +285,107 @@ Highlight trends, anomalies, and actionable insights.
 Context:
 {context}"""
 
+_ANALYSE_PREFIX = _static_prefix(ANALYSE_SYSTEM_PROMPT)
 
-def analyse_agent(state: AgentState) -> AgentState:
-    """Analytical comparison across documents."""
+# The four specialists differ only in prompt prefix and sampling parameters.
+# Keeping the (temperature, max_tokens) tuples to this small set also keeps
+# the lru-cached chat clients hot across modes.
+_AGENT_SPECS: dict[str, tuple[SystemMessage, float, int | None]] = {
+    "qa": (_QA_PREFIX, 0.1, None),
+    "research": (_RESEARCH_PREFIX, 0.2, 8192),
+    "summarise": (_SUMMARISE_PREFIX, 0.1, 4096),
+    "analyse": (_ANALYSE_PREFIX, 0.1, 8192),
+}
+
+
+def _run_agent(state: AgentState, agent: str) -> dict:
+    """Shared sync agent body — one cached-LLM call per specialist."""
+    prefix, temperature, max_tokens = _AGENT_SPECS[agent]
     context = _format_context(state["retrieved_documents"])
-    llm = LLMFactory.get_chat_model(temperature=0.1, max_tokens=8192)
 
-    messages = _build_messages(ANALYSE_SYSTEM_PROMPT.format(context=context), state)
-    response = llm.invoke(messages)
+    kwargs = {"temperature": temperature}
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    llm = LLMFactory.get_chat_model(**kwargs)
+
+    messages = _build_messages(prefix, context, state)
+    entry = invoke_cached(llm, messages, temperature=temperature, max_tokens=max_tokens)
 
-    state["answer"] = response.content
-    state["metadata"] = {
-        **state.get("metadata", {}),
-        "agent": "analyse",
-        "model": getattr(llm, "model_name", str(type(llm).__name__)),
+    return {
+        "answer": entry["content"],
+        "metadata": {
+            **state.get("metadata", {}),
+            "agent": agent,
+            "model": entry["model"],
+        },
     }
-    return state
+
+
+async def _arun_agent(state: AgentState, agent: str) -> dict:
+    """Shared async agent body — streams real tokens via llm.astream.
+
+    Token chunks propagate to astream_agent_graph through the model's
+    callback stream, so the first token reaches the client as soon as the
+    model emits it instead of after the full generation.
+    """
+    prefix, temperature, max_tokens = _AGENT_SPECS[agent]
+    context = _format_context(state["retrieved_documents"])
+
+    kwargs = {"temperature": temperature}
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    llm = LLMFactory.get_streaming_model(**kwargs)
+
+    messages = _build_messages(prefix, context, state)
+    entry = await astream_cached(llm, messages, temperature=temperature, max_tokens=max_tokens)
+
+    return {
+        "answer": entry["content"],
+        "metadata": {
+            **state.get("metadata", {}),
+            "agent": agent,
+            "model": entry["model"],
+        },
+    }
+
+
+# Named wrappers so LangGraph node names and test imports stay stable.
+
+
+def qa_agent(state: AgentState) -> dict:
+    """Direct Q&A from retrieved documents."""
+    return _run_agent(state, "qa")
+
+
+def research_agent(state: AgentState) -> dict:
+    """Deep research across multiple documents."""
+    return _run_agent(state, "research")
+
+
+def summarise_agent(state: AgentState) -> dict:
+    """Summarise documents or sections."""
+    return _run_agent(state, "summarise")
+
+
+def analyse_agent(state: AgentState) -> dict:
+    """Analytical comparison across documents."""
+    return _run_agent(state, "analyse")
+
+
+async def aqa_agent(state: AgentState) -> dict:
+    return await _arun_agent(state, "qa")
+
+
+async def aresearch_agent(state: AgentState) -> dict:
+    return await _arun_agent(state, "research")
+
+
+async def asummarise_agent(state: AgentState) -> dict:
+    return await _arun_agent(state, "summarise")
+
+
+async def aanalyse_agent(state: AgentState) -> dict:
+    return await _arun_agent(state, "analyse")
 
 
 # ---------------------------------------------------------------------------
@@ -213,19 +393,59 @@ def analyse_agent(state: AgentState) -> AgentState:
 # ---------------------------------------------------------------------------
 
 
+# Formatted-context memo: the same retrieved set recurs across turns of a
+# conversation, and rebuilding the multi-KB prompt string each time is pure
+# allocation. Plain dict with FIFO eviction — Documents aren't hashable, so
+# lru_cache doesn't apply.
+_CONTEXT_CACHE: dict[tuple[str, ...], str] = {}
+_CONTEXT_CACHE_MAX = 256
+
+
 def _format_context(documents) -> str:
     if not documents:
         return "No documents available."
 
+    # Canonical ordering: the same chunk set renders byte-identically no
+    # matter what order retrieval returned it in, so provider prompt caches
+    # and our exact-match response cache hit across reorderings.
+    documents = sorted(
+        documents,
+        key=lambda d: (d.metadata.get("document_id", ""), d.metadata.get("chunk_index", 0)),
+    )
+
+    key = tuple(doc.metadata.get("point_id", "") for doc in documents)
+    cache_key = key if all(key) else None  # only cacheable with stable ids
+    if cache_key is not None and cache_key in _CONTEXT_CACHE:
+        return _CONTEXT_CACHE[cache_key]
+
+    # BM25 and dense retrieval often hit the same passage; byte-exact dedup
+    # keeps duplicate tokens out of the prompt.
+    seen: set[bytes] = set()
+    unique = []
+    for doc in documents:
+        digest = hashlib.blake2b(doc.page_content.encode("utf-8"), digest_size=16).digest()
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(doc)
+    if len(unique) < len(documents):
+        logger.info("Deduplicated %d retrieved chunks", len(documents) - len(unique))
+
     parts = []
-    for i, doc in enumerate(documents, 1):
+    for i, doc in enumerate(unique, 1):
         source_id = doc.metadata.get("document_id", "unknown")[:8]
         parts.append(f"[Source {i}] (doc: {source_id})\n{doc.page_content}")
-    return "\n\n---\n\n".join(parts)
+    result = "\n\n---\n\n".join(parts)
+
+    if cache_key is not None:
+        if len(_CONTEXT_CACHE) >= _CONTEXT_CACHE_MAX:
+            _CONTEXT_CACHE.pop(next(iter(_CONTEXT_CACHE)))
+        _CONTEXT_CACHE[cache_key] = result
+    return result
 
 
-def _build_messages(system_prompt: str, state: AgentState) -> list:
-    messages = [SystemMessage(content=system_prompt)]
+def _build_messages(prefix: SystemMessage, context: str, state: AgentState) -> list:
+    # Static prefix first, volatile context second — see _static_prefix.
+    messages = [prefix, SystemMessage(content=context)]
 
     # Add conversation history
     for role, content in state.get("history", [])[-10:]:
@@ -0,0 +1,82 @@
+"""Semantic cache for the agent graph.
+
+Paraphrased queries ("What is CNN?" vs "Explain CNN") previously re-ran the
+full router → retriever → agent pipeline. Answers are cached in a dedicated
+Qdrant collection keyed by the query embedding, so a near-duplicate question
+costs one embedding call and one vector lookup instead of two LLM calls plus
+retrieval.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.conf import settings
+
+from core.vectorstore.qdrant_client import QdrantManager
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Embedding-similarity answer cache backed by Qdrant."""
+
+    COLLECTION_NAME = "semantic_cache"
+
+    def __init__(self):
+        self.qdrant = QdrantManager()
+
+    def lookup(self, query_vector: list[float], collection_id: str | None) -> dict[str, Any] | None:
+        """Return the cached result for a sufficiently similar query, if any."""
+        try:
+            hits = self.qdrant.search(
+                collection_name=self.COLLECTION_NAME,
+                query_vector=query_vector,
+                limit=1,
+                score_threshold=settings.SEMCACHE_THRESHOLD,
+                filter_conditions={"collection_id": collection_id or ""},
+            )
+        except Exception:
+            # Cache must never take down the request path (e.g. the cache
+            # collection does not exist yet).
+            return None
+
+        if not hits:
+            return None
+
+        payload = hits[0]["metadata"]
+        logger.info("Semantic cache hit (score=%.3f)", hits[0]["score"])
+        return {
+            "answer": hits[0]["content"],
+            "sources": payload.get("sources", []),
+            "model": payload.get("model", ""),
+            "metadata": {**payload.get("result_metadata", {}), "semantic_cache": True},
+        }
+
+    def store(
+        self,
+        query_vector: list[float],
+        query: str,
+        collection_id: str | None,
+        result: dict[str, Any],
+    ) -> None:
+        """Upsert a finished graph result under the query's embedding."""
+        try:
+            self.qdrant.ensure_collection(self.COLLECTION_NAME, len(query_vector))
+            self.qdrant.upsert_vectors(
+                collection_name=self.COLLECTION_NAME,
+                embeddings=[query_vector],
+                payloads=[
+                    {
+                        "content": result["answer"],
+                        "query": query,
+                        "collection_id": collection_id or "",
+                        "sources": result.get("sources", []),
+                        "model": result.get("model", ""),
+                        "result_metadata": result.get("metadata", {}),
+                    }
+                ],
+            )
+        except Exception:
+            logger.warning("Semantic cache store failed", exc_info=True)
@@ -28,6 +28,12 @@ class AgentState(TypedDict):
     # Collection ID for RAG retrieval
     collection_id: str | None
 
+    # Precomputed query embedding (lets the retriever skip its embed call)
+    query_embedding: list[float] | None
+
+    # Qdrant point ids retrieved for the previous turn (follow-up reuse)
+    prev_retrieved_ids: list[str]
+
     # User ID for personalisation / tracking
     user_id: str
 
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 
+from langchain_core.documents import Document
 from langchain_core.tools import tool
 
 from core.rag.retriever import HybridRetriever
@@ -75,17 +77,19 @@ def multi_query_search(queries: list[str], collection_id: str, top_k: int = 3) -
         use_compression=False,
     )
 
-    all_results = {}
-    for query in queries:
-        docs = retriever.retrieve(query)
+    # Dedup by a digest of the content itself, keeping the best-scoring
+    # copy. Keying on point_id collapsed every doc without one under "".
+    best: dict[bytes, Document] = {}
+    for docs in retriever.batch_retrieve(queries):
         for doc in docs:
-            point_id = doc.metadata.get("point_id", "")
-            if point_id not in all_results:
-                all_results[point_id] = doc
+            key = hashlib.blake2b(doc.page_content[:512].encode(), digest_size=16).digest()
+            kept = best.get(key)
+            if kept is None or doc.metadata.get("score", 0) > kept.metadata.get("score", 0):
+                best[key] = doc
 
     # Sort by score
     sorted_docs = sorted(
-        all_results.values(),
+        best.values(),
         key=lambda d: d.metadata.get("score", 0),
         reverse=True,
     )
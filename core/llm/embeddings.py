@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
+from functools import lru_cache
 
 from django.conf import settings
 from langchain_core.embeddings import Embeddings
@@ -11,6 +12,32 @@ from langchain_core.embeddings import Embeddings
 logger = logging.getLogger(__name__)
 
 
+# Configuration comes entirely from settings, so one client per provider is
+# ever needed — caching reuses its HTTP connection pool across requests.
+
+
+@lru_cache(maxsize=1)
+def _build_azure_embeddings() -> Embeddings:
+    from langchain_openai import AzureOpenAIEmbeddings
+
+    return AzureOpenAIEmbeddings(
+        azure_deployment=settings.AZURE_OPENAI_EMBEDDING_DEPLOYMENT,
+        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+        api_key=settings.AZURE_OPENAI_API_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION,
+    )
+
+
+@lru_cache(maxsize=1)
+def _build_bedrock_embeddings() -> Embeddings:
+    from langchain_aws import BedrockEmbeddings
+
+    return BedrockEmbeddings(
+        model_id=settings.AWS_BEDROCK_EMBEDDING_MODEL_ID,
+        region_name=settings.AWS_BEDROCK_REGION,
+    )
+
+
 class EmbeddingProvider(ABC):
     @abstractmethod
     def get_embeddings_model(self) -> Embeddings:
@@ -19,24 +46,12 @@ class EmbeddingProvider(ABC):
 
 class AzureOpenAIEmbeddingProvider(EmbeddingProvider):
     def get_embeddings_model(self) -> Embeddings:
-        from langchain_openai import AzureOpenAIEmbeddings
-
-        return AzureOpenAIEmbeddings(
-            azure_deployment=settings.AZURE_OPENAI_EMBEDDING_DEPLOYMENT,
-            azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-            api_key=settings.AZURE_OPENAI_API_KEY,
-            api_version=settings.AZURE_OPENAI_API_VERSION,
-        )
+        return _build_azure_embeddings()
 
 
 class BedrockEmbeddingProvider(EmbeddingProvider):
     def get_embeddings_model(self) -> Embeddings:
-        from langchain_aws import BedrockEmbeddings
-
-        return BedrockEmbeddings(
-            model_id=settings.AWS_BEDROCK_EMBEDDING_MODEL_ID,
-            region_name=settings.AWS_BEDROCK_REGION,
-        )
+        return _build_bedrock_embeddings()
 
 
 EMBEDDING_PROVIDER_MAP: dict[str, type[EmbeddingProvider]] = {
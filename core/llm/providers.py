@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import AsyncIterator
 
 from django.conf import settings
@@ -13,6 +14,44 @@ from langchain_core.messages import BaseMessage
 logger = logging.getLogger(__name__)
 
 
+# Client construction is expensive — each instance rebuilds an HTTP client
+# (and, for Bedrock, re-resolves AWS credentials). Cache by the parameters
+# that actually distinguish clients so connection pools are reused.
+
+
+@lru_cache(maxsize=32)
+def _build_azure_chat(temperature: float, max_tokens: int, streaming: bool) -> BaseChatModel:
+    from langchain_openai import AzureChatOpenAI
+
+    return AzureChatOpenAI(
+        azure_deployment=settings.AZURE_OPENAI_DEPLOYMENT,
+        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+        api_key=settings.AZURE_OPENAI_API_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        streaming=streaming,
+    )
+
+
+@lru_cache(maxsize=32)
+def _build_bedrock_chat(
+    temperature: float, max_tokens: int, streaming: bool, profile_name: str | None
+) -> BaseChatModel:
+    from langchain_aws import ChatBedrock
+
+    return ChatBedrock(
+        model_id=settings.AWS_BEDROCK_MODEL_ID,
+        region_name=settings.AWS_BEDROCK_REGION,
+        model_kwargs={
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        streaming=streaming,
+        credentials_profile_name=profile_name,
+    )
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
@@ -29,15 +68,10 @@ class AzureOpenAIProvider(LLMProvider):
     """Azure OpenAI provider using langchain-openai."""
 
     def get_chat_model(self, **kwargs) -> BaseChatModel:
-        from langchain_openai import AzureChatOpenAI
-
-        return AzureChatOpenAI(
-            azure_deployment=settings.AZURE_OPENAI_DEPLOYMENT,
-            azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-            api_key=settings.AZURE_OPENAI_API_KEY,
-            api_version=settings.AZURE_OPENAI_API_VERSION,
+        return _build_azure_chat(
             temperature=kwargs.get("temperature", 0.1),
             max_tokens=kwargs.get("max_tokens", 4096),
+            streaming=kwargs.get("streaming", False),
         )
 
     def get_streaming_model(self, **kwargs) -> BaseChatModel:
@@ -48,16 +82,11 @@ class BedrockProvider(LLMProvider):
     """AWS Bedrock provider using langchain-aws."""
 
     def get_chat_model(self, **kwargs) -> BaseChatModel:
-        from langchain_aws import ChatBedrock
-
-        return ChatBedrock(
-            model_id=settings.AWS_BEDROCK_MODEL_ID,
-            region_name=settings.AWS_BEDROCK_REGION,
-            model_kwargs={
-                "temperature": kwargs.get("temperature", 0.1),
-                "max_tokens": kwargs.get("max_tokens", 4096),
-            },
-            credentials_profile_name=kwargs.get("profile_name"),
+        return _build_bedrock_chat(
+            temperature=kwargs.get("temperature", 0.1),
+            max_tokens=kwargs.get("max_tokens", 4096),
+            streaming=kwargs.get("streaming", False),
+            profile_name=kwargs.get("profile_name"),
         )
 
     def get_streaming_model(self, **kwargs) -> BaseChatModel:
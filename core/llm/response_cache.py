@@ -0,0 +1,104 @@
+"""Exact-match response cache for LLM calls.
+
+The agent workload is bound by LLM API round-trips; when the same prompt is
+seen again (identical system prompt, history window, and query against the
+same provider and sampling parameters) the stored response is returned in
+microseconds instead of hundreds of milliseconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = 3600  # seconds
+
+
+def response_cache_key(messages, temperature: float, max_tokens: int | None = None) -> str:
+    """Deterministic key over every output-affecting parameter.
+
+    Only inputs that change the completion are hashed: the rendered messages
+    (system prompt already embeds the retrieved context), the configured
+    provider, and the sampling parameters. Credentials and transport options
+    are deliberately excluded.
+    """
+    # orjson: the messages blob is multi-KB and serialized on every LLM call.
+    digest = hashlib.sha256(
+        orjson.dumps(
+            {
+                "msgs": [(m.type, m.content) for m in messages],
+                "model": settings.LLM_PROVIDER,
+                "t": temperature,
+                "mx": max_tokens,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+    ).hexdigest()
+    return f"llmresp:{digest}"
+
+
+def invoke_cached(llm, messages, temperature: float, max_tokens: int | None = None) -> dict:
+    """Invoke the model through the cache; returns {"content", "model"}."""
+    key = response_cache_key(messages, temperature, max_tokens)
+    entry = cache.get(key)
+    if entry is not None:
+        logger.debug("LLM response cache hit")
+        return entry
+
+    response = llm.invoke(messages)
+    entry = {
+        "content": response.content,
+        "model": str(getattr(llm, "model_name", type(llm).__name__)),
+    }
+    cache.set(key, entry, RESPONSE_CACHE_TTL)
+    return entry
+
+
+async def ainvoke_cached(llm, messages, temperature: float, max_tokens: int | None = None) -> dict:
+    """Async twin of invoke_cached; cache I/O runs off the event loop."""
+    key = response_cache_key(messages, temperature, max_tokens)
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry is not None:
+        logger.debug("LLM response cache hit")
+        return entry
+
+    response = await llm.ainvoke(messages)
+    entry = {
+        "content": response.content,
+        "model": str(getattr(llm, "model_name", type(llm).__name__)),
+    }
+    await asyncio.to_thread(cache.set, key, entry, RESPONSE_CACHE_TTL)
+    return entry
+
+
+async def astream_cached(llm, messages, temperature: float, max_tokens: int | None = None) -> dict:
+    """Like ainvoke_cached, but consumes llm.astream on a miss.
+
+    Tokens surface to the caller through the model's callback stream (e.g.
+    LangGraph's astream_events); this helper just accumulates the final
+    content for the cache and the returned entry. The key matches the sync
+    path, so streamed and non-streamed calls share cached responses.
+    """
+    key = response_cache_key(messages, temperature, max_tokens)
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry is not None:
+        logger.debug("LLM response cache hit")
+        return entry
+
+    parts: list[str] = []
+    async for chunk in llm.astream(messages):
+        if chunk.content:
+            parts.append(chunk.content)
+    entry = {
+        "content": "".join(parts),
+        "model": str(getattr(llm, "model_name", type(llm).__name__)),
+    }
+    await asyncio.to_thread(cache.set, key, entry, RESPONSE_CACHE_TTL)
+    return entry
@@ -3,14 +3,22 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
 
+import orjson
 from django.conf import settings
 from django.core.cache import cache
-from django.http import JsonResponse
+from django.http import HttpResponse
+from django_redis import get_redis_connection
 
 logger = logging.getLogger(__name__)
 
+# Local increments accumulated before syncing a delta to Redis …
+_SYNC_EVERY = 5
+# … or sync anyway once the cached remote count is this stale (seconds)
+_SYNC_MAX_AGE = 0.5
+
 
 class RateLimitMiddleware:
     """
@@ -18,10 +26,19 @@ class RateLimitMiddleware:
 
     - Anonymous: 20 req/min
     - Authenticated: 100 req/min
+
+    To keep Redis off the per-request critical path, each process counts
+    hits locally and syncs deltas every _SYNC_EVERY increments or
+    _SYNC_MAX_AGE seconds. The limit can therefore over-admit by at most
+    _SYNC_EVERY × worker_processes requests per window — an accepted trade
+    for dropping the Redis round-trip from most requests.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self._lock = threading.Lock()
+        self._pending: dict[str, int] = {}  # unsynced local increments
+        self._synced: dict[str, tuple[float, int]] = {}  # key -> (at, remote count)
 
     def __call__(self, request):
         # Only rate-limit API endpoints
@@ -37,23 +54,67 @@ class RateLimitMiddleware:
             limit = 20
 
         window = 60  # seconds
-        now = time.time()
-        window_key = f"{key}:{int(now // window)}"
+        window_key = f"{key}:{int(time.time() // window)}"
 
-        current = cache.get(window_key, 0)
-        if current >= limit:
-            return JsonResponse(
-                {"detail": "Rate limit exceeded. Try again later."},
+        current = self._count_request(window_key, window)
+        if current > limit:
+            return HttpResponse(
+                orjson.dumps({"detail": "Rate limit exceeded. Try again later."}),
                 status=429,
+                content_type="application/json",
             )
 
-        cache.set(window_key, current + 1, timeout=window)
-
         response = self.get_response(request)
         response["X-RateLimit-Limit"] = str(limit)
-        response["X-RateLimit-Remaining"] = str(max(0, limit - current - 1))
+        response["X-RateLimit-Remaining"] = str(max(0, limit - current))
         return response
 
+    def _count_request(self, window_key: str, window: int) -> int:
+        """Count this request in its window and return the running total."""
+        now = time.monotonic()
+        with self._lock:
+            pending = self._pending.get(window_key, 0) + 1
+            self._pending[window_key] = pending
+            synced = self._synced.get(window_key)
+            if (
+                synced is not None
+                and pending < _SYNC_EVERY
+                and now - synced[0] < _SYNC_MAX_AGE
+            ):
+                return synced[1] + pending
+            self._pending[window_key] = 0
+
+        total = self._sync(window_key, pending, window)
+        with self._lock:
+            self._synced[window_key] = (now, total)
+            if len(self._synced) > 4096:
+                self._prune(now)
+        return total
+
+    def _prune(self, now: float) -> None:
+        """Drop counters for windows that have long since closed."""
+        stale = [k for k, (at, _) in self._synced.items() if now - at > 120]
+        for k in stale:
+            self._synced.pop(k, None)
+            self._pending.pop(k, None)
+
+    @staticmethod
+    def _sync(window_key: str, delta: int, window: int) -> int:
+        """Push a local delta to the shared counter and return the total."""
+        try:
+            conn = get_redis_connection("default")
+        except Exception:
+            # Non-Redis cache backend (tests, local dev): two-step fallback
+            cache.add(window_key, 0, timeout=window)
+            try:
+                return cache.incr(window_key, delta)
+            except ValueError:
+                return delta
+        pipe = conn.pipeline()
+        pipe.incrby(window_key, delta)
+        pipe.expire(window_key, window)
+        return pipe.execute()[0]
+
     @staticmethod
     def _get_client_ip(request) -> str:
         x_forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
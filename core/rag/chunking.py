@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import re
+from collections.abc import Iterable, Iterator
 
 from django.conf import settings
 from langchain_text_splitters import (
@@ -14,6 +15,16 @@ from langchain_text_splitters import (
 
 logger = logging.getLogger(__name__)
 
+# Hoisted out of _clean_chunk — re.sub's internal pattern cache costs a
+# lookup and lock acquire per call, which adds up over millions of chunks.
+_RE_NEWLINES = re.compile(r"\n{3,}")
+_RE_SPACES = re.compile(r" {2,}")
+
+# Characters accumulated before the streaming chunker runs the splitter.
+# Large enough to amortise splitter overhead, small enough that the buffer
+# — not the whole document — bounds peak memory.
+_STREAM_BUFFER_CHARS = 100_000
+
 
 def chunk_document(
     text: str,
@@ -71,6 +82,71 @@ def chunk_document(
     return chunks
 
 
+def iter_chunk_document(
+    sections: Iterable[str],
+    metadata: dict | None = None,
+    chunk_size: int | None = None,
+    chunk_overlap: int | None = None,
+    strategy: str = "recursive",
+) -> Iterator[dict]:
+    """
+    Streaming counterpart of chunk_document.
+
+    Consumes an iterable of page/section strings (see
+    RAGPipeline.iter_document_sections), buffers ~100 KB of text at a time,
+    and yields chunk dicts as each buffer is split. The last raw chunk of a
+    buffer is carried into the next one so overlap spans buffer boundaries.
+    Peak memory is bounded by the buffer, not the document.
+    """
+    chunk_size = chunk_size or settings.CHUNK_SIZE
+    chunk_overlap = chunk_overlap or settings.CHUNK_OVERLAP
+    metadata = metadata or {}
+
+    splitter = _get_splitter(strategy, chunk_size, chunk_overlap)
+    buffer = ""
+    index = 0
+
+    def _emit(raw_chunks: list[str]) -> Iterator[dict]:
+        nonlocal index
+        for content in raw_chunks:
+            content = _clean_chunk(content)
+            if len(content.strip()) < 20:
+                continue
+            yield {
+                "chunk_index": index,
+                "content": content,
+                "token_count": _estimate_tokens(content),
+                "metadata": {
+                    **metadata,
+                    "strategy": strategy,
+                    "char_count": len(content),
+                },
+            }
+            index += 1
+
+    for section in sections:
+        buffer = f"{buffer}\n\n{section}" if buffer else section
+        if len(buffer) < _STREAM_BUFFER_CHARS:
+            continue
+
+        raw_chunks = splitter.split_text(buffer)
+        # Hold the final raw chunk back so the next buffer starts with it
+        # and the splitter can overlap across the boundary.
+        buffer = raw_chunks.pop() if raw_chunks else ""
+        yield from _emit(raw_chunks)
+
+    if buffer:
+        yield from _emit(splitter.split_text(buffer))
+
+    logger.info(
+        "Chunked document stream: %d chunks (strategy=%s, size=%d, overlap=%d)",
+        index,
+        strategy,
+        chunk_size,
+        chunk_overlap,
+    )
+
+
 def _get_splitter(strategy: str, chunk_size: int, chunk_overlap: int):
     if strategy == "markdown":
         return MarkdownTextSplitter(
@@ -92,8 +168,8 @@ def _get_splitter(strategy: str, chunk_size: int, chunk_overlap: int):
 
 
 def _clean_chunk(text: str) -> str:
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r" {2,}", " ", text)
+    text = _RE_NEWLINES.sub("\n\n", text)
+    text = _RE_SPACES.sub(" ", text)
     return text.strip()
 
 
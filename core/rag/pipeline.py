@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from django.conf import settings
+
 from langchain_community.document_loaders import (
     CSVLoader,
     JSONLoader,
@@ -65,15 +70,63 @@ class RAGPipeline:
         )
         return full_text
 
+    def iter_document_sections(self, file_path: str, file_type: str) -> Iterator[str]:
+        """Lazily yield page/section text without materialising the document.
+
+        Streaming counterpart of load_document: each page is parsed, yielded,
+        and dropped, so peak memory stays flat for arbitrarily large files.
+        """
+        loader_cls = LOADER_MAP.get(file_type)
+        if loader_cls is None:
+            raise ValueError(f"Unsupported file type: {file_type}")
+
+        kwargs = {"file_path": file_path}
+        if file_type == "json":
+            kwargs["jq_schema"] = "."
+            kwargs["text_content"] = False
+
+        for doc in loader_cls(**kwargs).lazy_load():
+            yield doc.page_content
+
     def embed_texts(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for a list of text chunks."""
-        # Batch to avoid rate limits
-        batch_size = 50
-        all_embeddings = []
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            embeddings = self.embeddings.embed_documents(batch)
-            all_embeddings.extend(embeddings)
+        """Embed texts in large concurrent batches from sync callers.
+
+        Not a facade over aembed_texts: the lru-cached embeddings client
+        keeps keep-alive connections bound to the loop it first ran on, so
+        repeated asyncio.run calls from a Celery worker would hit a closed
+        loop. Batches fan out over a thread pool instead, bounded by the
+        same EMBED_CONCURRENCY.
+        """
+        batch_size = settings.EMBED_BATCH_SIZE
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        if len(batches) <= 1:
+            return self.embeddings.embed_documents(texts) if texts else []
+
+        with ThreadPoolExecutor(max_workers=settings.EMBED_CONCURRENCY) as executor:
+            results = list(executor.map(self.embeddings.embed_documents, batches))
+        all_embeddings = [embedding for result in results for embedding in result]
+
+        logger.info("Generated %d embeddings", len(all_embeddings))
+        return all_embeddings
+
+    async def aembed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in large concurrent batches.
+
+        Both Azure OpenAI and Bedrock accept far more inputs per request
+        than the old fixed batch of 50, so fewer, bigger requests are
+        issued and kept in flight concurrently behind a semaphore to hide
+        per-request latency without tripping rate limits.
+        """
+        sem = asyncio.Semaphore(settings.EMBED_CONCURRENCY)
+        batch_size = settings.EMBED_BATCH_SIZE
+
+        async def _one(batch: list[str]) -> list[list[float]]:
+            async with sem:
+                return await self.embeddings.aembed_documents(batch)
+
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(_one(b) for b in batches))
+        all_embeddings = [embedding for result in results for embedding in result]
 
         logger.info("Generated %d embeddings", len(all_embeddings))
         return all_embeddings
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-from langchain.retrievers import ContextualCompressionRetriever
+import numpy as np
+from django.conf import settings
 from langchain.retrievers.document_compressors import LLMChainExtractor
 from langchain_core.documents import Document
 
@@ -13,6 +19,69 @@ from core.vectorstore.qdrant_client import QdrantManager
 
 logger = logging.getLogger(__name__)
 
+# Process-local LRU of query embeddings: repeated questions skip the
+# embedding-model round-trip, the dominant fixed cost in retrieve().
+_EMBED_CACHE_MAX = 4096
+_embed_cache: OrderedDict[str, list[float]] = OrderedDict()
+_embed_cache_lock = threading.Lock()
+
+
+async def _empty() -> list[Document]:
+    return []
+
+
+def _embed_cache_key(query: str) -> str:
+    return f"{settings.LLM_PROVIDER}:{hashlib.sha256(query.encode()).hexdigest()}"
+
+
+def _embed_cache_get(key: str) -> list[float] | None:
+    with _embed_cache_lock:
+        vector = _embed_cache.get(key)
+        if vector is not None:
+            _embed_cache.move_to_end(key)
+    return vector
+
+
+def _embed_cache_put(key: str, vector: list[float]) -> None:
+    with _embed_cache_lock:
+        _embed_cache[key] = vector
+        if len(_embed_cache) > _EMBED_CACHE_MAX:
+            _embed_cache.popitem(last=False)
+
+
+# LLMLingua-2 token classifier for local extractive compression — a BERT
+# forward pass per batch (~100 ms on CPU) instead of one LLM round-trip per
+# document. Loaded lazily once per process; False marks a failed load so we
+# don't retry on every call.
+_LLMLINGUA_MODEL = "microsoft/llmlingua-2-bert-base-multilingual-cased-meetingbank"
+_local_compressor = None
+_local_compressor_lock = threading.Lock()
+
+
+def _get_local_compressor():
+    global _local_compressor
+    if _local_compressor is None:
+        with _local_compressor_lock:
+            if _local_compressor is None:
+                try:
+                    import torch
+                    from transformers import (
+                        AutoModelForTokenClassification,
+                        AutoTokenizer,
+                    )
+
+                    tokenizer = AutoTokenizer.from_pretrained(_LLMLINGUA_MODEL)
+                    model = AutoModelForTokenClassification.from_pretrained(_LLMLINGUA_MODEL)
+                    model.eval()
+                    _local_compressor = (tokenizer, model, torch)
+                    logger.info("Loaded local compressor: %s", _LLMLINGUA_MODEL)
+                except Exception:
+                    logger.warning(
+                        "Local compressor unavailable, will fall back to LLM extraction"
+                    )
+                    _local_compressor = False
+    return _local_compressor or None
+
 
 class HybridRetriever:
     """
@@ -29,19 +98,30 @@ class HybridRetriever:
         rerank_top_k: int = 5,
         score_threshold: float = 0.65,
         use_compression: bool = True,
+        max_workers: int = 4,
+        compression_strategy: str = "local",
+        compression_min_tokens: int = 1500,
     ):
         self.collection_id = collection_id
         self.top_k = top_k
         self.rerank_top_k = rerank_top_k
         self.score_threshold = score_threshold
         self.use_compression = use_compression
+        self.max_workers = max_workers
+        self.compression_strategy = compression_strategy
+        self.compression_min_tokens = compression_min_tokens
         self.qdrant = QdrantManager()
         self.embeddings = LLMFactory.get_embeddings()
 
-    def retrieve(self, query: str) -> list[Document]:
-        """Full retrieval pipeline: embed → search → rerank → compress."""
-        # 1. Embed the query
-        query_vector = self.embeddings.embed_query(query)
+    def retrieve(self, query: str, query_vector: list[float] | None = None) -> list[Document]:
+        """Full retrieval pipeline: embed → search → rerank → compress.
+
+        Pass a precomputed ``query_vector`` (e.g. one already produced for
+        the semantic cache) to skip the embedding round-trip.
+        """
+        # 1. Embed the query unless the caller already has the vector
+        if query_vector is None:
+            query_vector = self._embed(query)
 
         # 2. Dense search
         results = self.qdrant.search(
@@ -55,24 +135,27 @@ class HybridRetriever:
             logger.info("No results above threshold for query: %s", query[:100])
             return []
 
-        # 3. Re-rank by score (Qdrant already returns sorted, but we can add
-        #    cross-encoder re-ranking here when needed)
-        results = self._rerank(query, results)[: self.rerank_top_k]
-
-        # 4. Convert to LangChain Documents
-        documents = [
-            Document(
-                page_content=r["content"],
-                metadata={
-                    "score": r["score"],
-                    "point_id": r["id"],
-                    **r["metadata"],
-                },
-            )
-            for r in results
-        ]
+        return self._postprocess(query, results)
+
+    def _postprocess(self, query: str, results: list[dict]) -> list[Document]:
+        """Shared tail of the pipeline: rerank → Documents → compress."""
+        # Tokenize the query once here rather than inside _rerank.
+        query_tokens = frozenset(query.lower().split())
+
+        # Re-rank by score (Qdrant already returns sorted, but we can add
+        # cross-encoder re-ranking here when needed)
+        results = self._rerank(query_tokens, results)[: self.rerank_top_k]
+
+        # Reuse the metadata dict search() already allocated per hit instead
+        # of rebuilding it with a ** spread.
+        documents = []
+        for r in results:
+            metadata = r["metadata"]
+            metadata.setdefault("score", r["score"])
+            metadata.setdefault("point_id", r["id"])
+            documents.append(Document(page_content=r["content"], metadata=metadata))
 
-        # 5. Contextual compression (optional)
+        # Contextual compression (optional)
         if self.use_compression and documents:
             documents = self._compress(query, documents)
 
@@ -83,43 +166,205 @@ class HybridRetriever:
         )
         return documents
 
-    def _rerank(self, query: str, results: list[dict]) -> list[dict]:
+    def retrieve_by_ids(self, point_ids: list[str]) -> list[Document]:
+        """Rehydrate previously retrieved documents by point id.
+
+        Skips embedding and search entirely — used for follow-up turns that
+        reuse the prior turn's context.
+        """
+        documents = []
+        for r in self.qdrant.retrieve_points(self.collection_id, point_ids):
+            metadata = r["metadata"]
+            metadata.setdefault("score", r["score"])
+            metadata.setdefault("point_id", r["id"])
+            documents.append(Document(page_content=r["content"], metadata=metadata))
+        return documents
+
+    async def aretrieve(
+        self, query: str, query_vector: list[float] | None = None
+    ) -> list[Document]:
+        """Async retrieval: embed via the async API, run the rest off-loop."""
+        if query_vector is None:
+            query_vector = await self._aembed(query)
+        return await asyncio.to_thread(self.retrieve, query, query_vector)
+
+    def _embed(self, query: str) -> list[float]:
+        """Cache-aware sync query embedding."""
+        key = _embed_cache_key(query)
+        vector = _embed_cache_get(key)
+        if vector is None:
+            logger.debug("Query-embedding cache miss")
+            vector = self.embeddings.embed_query(query)
+            _embed_cache_put(key, vector)
+        else:
+            logger.debug("Query-embedding cache hit")
+        return vector
+
+    async def _aembed(self, query: str) -> list[float]:
+        key = _embed_cache_key(query)
+        vector = _embed_cache_get(key)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(query)
+            _embed_cache_put(key, vector)
+        return vector
+
+    async def abatch_retrieve(
+        self, queries: list[str], query_vectors: list[list[float]] | None = None
+    ) -> list[list[Document]]:
+        """Retrieve for several queries with all searches in flight together.
+
+        Embeddings and Qdrant searches fan out over the async clients, so M
+        queries cost roughly one round-trip of each; rerank/compression for
+        each query then runs off-loop in worker threads.
+        """
+        if query_vectors is None:
+            query_vectors = await asyncio.gather(*(self._aembed(q) for q in queries))
+        batches = await self.qdrant.search_many(
+            self.collection_id,
+            query_vectors,
+            limit=self.top_k,
+            score_threshold=self.score_threshold,
+        )
+        return await asyncio.gather(
+            *(
+                asyncio.to_thread(self._postprocess, query, results) if results else _empty()
+                for query, results in zip(queries, batches)
+            )
+        )
+
+    def batch_retrieve(self, queries: list[str]) -> list[list[Document]]:
+        """Sync facade over abatch_retrieve.
+
+        Embeds on the sync client first — the async embeddings client pins
+        its HTTP pool to the first event loop, so awaiting it inside the
+        short-lived asyncio.run loop would break on the second call. Only
+        the Qdrant fan-out (whose async client is cached per loop) runs in
+        the private loop.
+        """
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries))) as executor:
+            query_vectors = list(executor.map(self._embed, queries))
+        return asyncio.run(self.abatch_retrieve(queries, query_vectors))
+
+    @classmethod
+    def clear_embedding_cache(cls) -> None:
+        """Drop all cached query embeddings (e.g. after a model switch)."""
+        with _embed_cache_lock:
+            _embed_cache.clear()
+
+    def _rerank(self, query_tokens: frozenset[str], results: list[dict]) -> list[dict]:
         """
         Re-rank results using reciprocal rank fusion.
         Can be extended with a cross-encoder model for production.
+
+        Scores and keyword overlaps are computed as NumPy kernels over
+        hashed tokens, keeping the per-result work in C rather than Python
+        set machinery — the difference grows with top_k. The query is
+        tokenized once by the caller and passed in pre-split.
         """
-        for r in results:
-            query_terms = set(query.lower().split())
-            content_terms = set(r["content"].lower().split())
-            keyword_overlap = len(query_terms & content_terms) / max(len(query_terms), 1)
-            r["combined_score"] = (r["score"] * 0.7) + (keyword_overlap * 0.3)
+        if not results:
+            return results
 
-        results.sort(key=lambda x: x["combined_score"], reverse=True)
-        return results
+        query_hashes = np.fromiter((hash(t) for t in query_tokens), dtype=np.int64)
+        denominator = max(query_hashes.size, 1)
+
+        scores = np.fromiter((r["score"] for r in results), dtype=np.float64, count=len(results))
+        overlaps = np.empty(len(results), dtype=np.float64)
+        for i, r in enumerate(results):
+            # Token sets are precomputed at ingest and stored in the payload;
+            # tokenize on the fly only for points indexed before that.
+            content_terms = r["metadata"].pop("content_tokens", None)
+            if content_terms is None:
+                content_terms = set(r["content"].lower().split())
+            content_hashes = np.fromiter((hash(t) for t in content_terms), dtype=np.int64)
+            overlaps[i] = np.intersect1d(query_hashes, content_hashes, assume_unique=True).size
+
+        combined = scores * 0.7 + (overlaps / denominator) * 0.3
+        order = np.argsort(-combined)
+        reranked = [results[i] for i in order]
+        for r, score in zip(reranked, combined[order]):
+            r["combined_score"] = float(score)
+        return reranked
 
     def _compress(self, query: str, documents: list[Document]) -> list[Document]:
-        """Use LLM-based contextual compression to extract relevant passages."""
-        try:
-            llm = LLMFactory.get_chat_model(temperature=0)
-            compressor = LLMChainExtractor.from_llm(llm)
-            compression_retriever = ContextualCompressionRetriever(
-                base_compressor=compressor,
-                base_retriever=_StaticRetriever(documents),
+        """Compress documents with the configured strategy.
+
+        "local" runs the LLMLingua-2 token classifier on this machine and
+        falls back to LLM extraction when transformers/torch (or the model)
+        are not available; "llm" always uses the extractor.
+
+        Contexts already under ``compression_min_tokens`` are returned as-is:
+        compressing them costs more than the tokens it would save, and the
+        cheapest compression is not running the compressor at all.
+        """
+        approx_tokens = sum(len(doc.page_content) // 4 for doc in documents)
+        if approx_tokens < self.compression_min_tokens:
+            logger.debug(
+                "Skipping compression: ~%d tokens below budget of %d",
+                approx_tokens,
+                self.compression_min_tokens,
             )
-            return compression_retriever.invoke(query)
-        except Exception:
-            logger.warning("Compression failed, returning uncompressed documents")
             return documents
 
+        if self.compression_strategy == "local":
+            compressed = self._compress_local(documents)
+            if compressed is not None:
+                return compressed
+        return self._compress_llm(query, documents)
+
+    def _compress_local(self, documents: list[Document]) -> list[Document] | None:
+        """Token-level extractive compression via a local BERT classifier."""
+        loaded = _get_local_compressor()
+        if loaded is None:
+            return None
+        tokenizer, model, torch = loaded
+
+        batch = tokenizer(
+            [doc.page_content for doc in documents],
+            padding=True,
+            truncation=True,
+            return_tensors="pt",
+        )
+        with torch.no_grad():
+            logits = model(**batch).logits
+        keep = logits.argmax(dim=-1) == 1  # label 1 = preserve token
 
-class _StaticRetriever:
-    """Minimal retriever that returns pre-fetched documents."""
+        compressed_docs = []
+        for i, doc in enumerate(documents):
+            mask = batch["attention_mask"][i].bool() & keep[i]
+            text = tokenizer.decode(batch["input_ids"][i][mask], skip_special_tokens=True)
+            if text.strip():
+                compressed_docs.append(Document(page_content=text, metadata=doc.metadata))
+        return compressed_docs
 
-    def __init__(self, docs: list[Document]):
-        self._docs = docs
+    def _compress_llm(self, query: str, documents: list[Document]) -> list[Document]:
+        """Use LLM-based contextual compression to extract relevant passages.
+
+        Each document is compressed by an independent LLM round-trip, so
+        they fan out over a thread pool: wall clock drops from
+        N x llm_latency to roughly one llm_latency. A document whose
+        compression fails is kept uncompressed; one the extractor deems
+        irrelevant is dropped, matching LLMChainExtractor semantics.
+        """
+        try:
+            llm = LLMFactory.get_chat_model(temperature=0)
+            compressor = LLMChainExtractor.from_llm(llm)
+        except Exception:
+            logger.warning("Compression unavailable, returning uncompressed documents")
+            return documents
 
-    def invoke(self, query: str, **kwargs) -> list[Document]:
-        return self._docs
+        def _one(doc: Document) -> Document | None:
+            compressed = compressor.compress_documents([doc], query)
+            return compressed[0] if compressed else None
 
-    def get_relevant_documents(self, query: str) -> list[Document]:
-        return self._docs
+        compressed_docs = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(documents))) as executor:
+            futures = [executor.submit(_one, doc) for doc in documents]
+            for doc, future in zip(documents, futures):
+                try:
+                    result = future.result()
+                except Exception:
+                    logger.warning("Compression failed for a document, keeping original")
+                    result = doc
+                if result is not None:
+                    compressed_docs.append(result)
+        return compressed_docs
@@ -0,0 +1,141 @@
+"""LSH-backed semantic cache for whole retrieval results."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+
+class RandomProjectionLSH:
+    """Process-local cache of retrieval results keyed by random-projection LSH.
+
+    Semantically similar queries ("what is RAG?" / "explain RAG") land in the
+    same sign-bit buckets against shared random hyperplanes, so a hit skips
+    the whole search → rerank → compress pipeline. Candidates from the probed
+    buckets are verified with an exact cosine check before reuse; entries
+    expire by TTL and evict least-frequently-used first.
+    """
+
+    def __init__(
+        self,
+        n_planes: int = 16,
+        n_tables: int = 4,
+        threshold: float = 0.95,
+        max_entries: int = 512,
+        ttl_seconds: int = 900,
+    ):
+        self.n_planes = n_planes
+        self.n_tables = n_tables
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # Hyperplanes are built lazily from the first stored vector, so the
+        # cache adapts to whatever dimension the embedding model produces.
+        self._planes: np.ndarray | None = None
+        self._powers = 1 << np.arange(n_planes)
+        self._tables: list[dict[int, set[int]]] = [{} for _ in range(n_tables)]
+        self._entries: dict[int, dict] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, query_vector: list[float], collection_id: str | None) -> list[Document] | None:
+        """Return cached documents for a near-duplicate query, or None."""
+        with self._lock:
+            if self._planes is None:
+                return None
+            unit = _unit(np.asarray(query_vector, dtype=np.float64))
+            now = time.monotonic()
+
+            candidate_ids: set[int] = set()
+            for table, key in zip(self._tables, self._bucket_keys(unit)):
+                candidate_ids |= table.get(key, set())
+
+            best_id = None
+            best_sim = self.threshold
+            for entry_id in list(candidate_ids):
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                if now - entry["at"] > self.ttl_seconds:
+                    self._evict(entry_id)
+                    continue
+                if entry["collection"] != collection_id:
+                    continue
+                sim = float(unit @ entry["vec"])
+                if sim >= best_sim:
+                    best_id, best_sim = entry_id, sim
+
+            if best_id is None:
+                return None
+            entry = self._entries[best_id]
+            entry["hits"] += 1
+            logger.info("Retrieval semantic cache hit (sim=%.3f)", best_sim)
+            return list(entry["docs"])
+
+    def store(
+        self,
+        query_vector: list[float],
+        collection_id: str | None,
+        documents: list[Document],
+    ) -> None:
+        """Cache a query's final retrieval result."""
+        if not documents:
+            return
+        vec = np.asarray(query_vector, dtype=np.float64)
+        with self._lock:
+            if self._planes is None:
+                rng = np.random.default_rng()
+                self._planes = rng.standard_normal((self.n_tables, self.n_planes, vec.shape[0]))
+            unit = _unit(vec)
+
+            while len(self._entries) >= self.max_entries:
+                coldest = min(
+                    self._entries.items(), key=lambda kv: (kv[1]["hits"], kv[1]["at"])
+                )[0]
+                self._evict(coldest)
+
+            entry_id = self._next_id
+            self._next_id += 1
+            keys = self._bucket_keys(unit)
+            self._entries[entry_id] = {
+                "vec": unit,
+                "docs": list(documents),
+                "collection": collection_id,
+                "at": time.monotonic(),
+                "hits": 0,
+                "keys": keys,
+            }
+            for table, key in zip(self._tables, keys):
+                table.setdefault(key, set()).add(entry_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            for table in self._tables:
+                table.clear()
+            self._entries.clear()
+
+    def _bucket_keys(self, unit: np.ndarray) -> list[int]:
+        signs = (self._planes @ unit) >= 0  # (n_tables, n_planes) sign bits
+        return [int(signs[i].dot(self._powers)) for i in range(self.n_tables)]
+
+    def _evict(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for table, key in zip(self._tables, entry["keys"]):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del table[key]
+
+
+def _unit(vec: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
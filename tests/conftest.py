@@ -4,6 +4,7 @@ import uuid
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.core.cache import cache
 from django.test import RequestFactory
 from rest_framework.test import APIClient
 
@@ -11,6 +12,13 @@ from apps.accounts.models import User
 from apps.documents.models import Collection, Document
 
 
+@pytest.fixture(autouse=True)
+def _isolate_cache():
+    """Each test gets a clean cache — no shared rate-limit or auth state."""
+    cache.clear()
+    yield
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -1,8 +1,14 @@
 """API integration tests."""
 
+from datetime import timedelta
+
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import APIKey, User
 
 pytestmark = pytest.mark.django_db
 
@@ -48,6 +54,58 @@ class TestAuthEndpoints:
         assert response.data["username"] == user.username
 
 
+class TestAPIKeyAuth:
+    def _create_key(self, auth_client, **extra):
+        response = auth_client.post(reverse("accounts:api_keys"), {"name": "test key", **extra})
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.data["key"], APIKey.objects.get(id=response.data["id"])
+
+    def _get_profile(self, raw_key):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Api-Key {raw_key}")
+        return client.get(reverse("accounts:profile"))
+
+    def test_valid_key_authenticates(self, auth_client, user):
+        raw_key, _ = self._create_key(auth_client)
+        response = self._get_profile(raw_key)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["username"] == user.username
+
+    def test_malformed_key_rejected(self):
+        response = self._get_profile("not-a-key")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_unknown_key_rejected(self):
+        response = self._get_profile("dm_" + "A" * 43)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_expired_key_rejected(self, auth_client):
+        expired = (timezone.now() - timedelta(hours=1)).isoformat()
+        raw_key, _ = self._create_key(auth_client, expires_at=expired)
+        response = self._get_profile(raw_key)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoked_key_rejected(self, auth_client):
+        raw_key, key = self._create_key(auth_client)
+        assert self._get_profile(raw_key).status_code == status.HTTP_200_OK
+        auth_client.delete(reverse("accounts:api_key_delete", kwargs={"id": key.id}))
+        assert self._get_profile(raw_key).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deleted_user_with_warm_cache_rejected(self, auth_client, user):
+        # The cached prefix entry outlives the user row; authentication must
+        # fail cleanly rather than raise User.DoesNotExist.
+        raw_key, _ = self._create_key(auth_client)
+        assert self._get_profile(raw_key).status_code == status.HTTP_200_OK
+        user.delete()
+        assert self._get_profile(raw_key).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_inactive_user_rejected(self, auth_client, user):
+        raw_key, _ = self._create_key(auth_client)
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        assert self._get_profile(raw_key).status_code == status.HTTP_401_UNAUTHORIZED
+
+
 class TestCollectionEndpoints:
     def test_create_collection(self, auth_client):
         response = auth_client.post(
@@ -70,8 +128,6 @@ class TestCollectionEndpoints:
         assert response.data["name"] == collection.name
 
     def test_collection_not_owned(self, api_client, collection, db):
-        from apps.accounts.models import User
-
         other_user = User.objects.create_user(
             username="other", email="other@example.com", password="pass123"
         )
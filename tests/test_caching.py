@@ -0,0 +1,144 @@
+"""Tests for the process-local caching and rate-limit batching layers."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from django.http import HttpResponse
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from core.llm.response_cache import invoke_cached, response_cache_key
+from core.middleware.rate_limiting import RateLimitMiddleware
+from core.rag.semantic_cache import RandomProjectionLSH
+
+
+def _docs(label: str) -> list[Document]:
+    return [Document(page_content=f"content for {label}", metadata={"label": label})]
+
+
+class TestRandomProjectionLSH:
+    def test_identical_vector_hits(self):
+        cache = RandomProjectionLSH()
+        vector = list(np.random.default_rng(0).standard_normal(64))
+        cache.store(vector, "col-1", _docs("a"))
+
+        hit = cache.lookup(vector, "col-1")
+        assert hit is not None
+        assert hit[0].metadata["label"] == "a"
+
+    def test_scaled_vector_hits(self):
+        # Cosine similarity is scale-invariant, so a rescaled query should
+        # land in the same buckets and pass the exact check.
+        cache = RandomProjectionLSH()
+        vector = np.random.default_rng(1).standard_normal(64)
+        cache.store(list(vector), "col-1", _docs("a"))
+        assert cache.lookup(list(vector * 2.0), "col-1") is not None
+
+    def test_other_collection_misses(self):
+        cache = RandomProjectionLSH()
+        vector = list(np.random.default_rng(2).standard_normal(64))
+        cache.store(vector, "col-1", _docs("a"))
+        assert cache.lookup(vector, "col-2") is None
+
+    def test_dissimilar_vector_misses(self):
+        cache = RandomProjectionLSH()
+        vector = np.zeros(64)
+        vector[0] = 1.0
+        orthogonal = np.zeros(64)
+        orthogonal[1] = 1.0
+        cache.store(list(vector), "col-1", _docs("a"))
+        assert cache.lookup(list(orthogonal), "col-1") is None
+
+    def test_ttl_expiry_evicts(self):
+        cache = RandomProjectionLSH(ttl_seconds=0)
+        vector = list(np.random.default_rng(3).standard_normal(64))
+        cache.store(vector, "col-1", _docs("a"))
+        time.sleep(0.01)
+        assert cache.lookup(vector, "col-1") is None
+        assert not cache._entries
+
+    def test_lfu_eviction_keeps_hot_entries(self):
+        cache = RandomProjectionLSH(max_entries=2)
+        rng = np.random.default_rng(4)
+        hot = list(rng.standard_normal(64))
+        cold = list(rng.standard_normal(64))
+        newcomer = list(rng.standard_normal(64))
+
+        cache.store(hot, "col-1", _docs("hot"))
+        cache.store(cold, "col-1", _docs("cold"))
+        assert cache.lookup(hot, "col-1") is not None  # hot now has a hit
+
+        cache.store(newcomer, "col-1", _docs("new"))
+        assert cache.lookup(hot, "col-1") is not None
+        assert cache.lookup(cold, "col-1") is None
+
+    def test_empty_result_not_stored(self):
+        cache = RandomProjectionLSH()
+        vector = list(np.random.default_rng(5).standard_normal(64))
+        cache.store(vector, "col-1", [])
+        assert cache.lookup(vector, "col-1") is None
+
+
+class TestResponseCacheKey:
+    def test_key_stable_for_same_inputs(self):
+        messages = [SystemMessage(content="sys"), HumanMessage(content="q")]
+        assert response_cache_key(messages, 0.1) == response_cache_key(messages, 0.1)
+
+    def test_key_sensitive_to_messages(self):
+        base = [SystemMessage(content="sys"), HumanMessage(content="q")]
+        other = [SystemMessage(content="sys"), HumanMessage(content="different")]
+        assert response_cache_key(base, 0.1) != response_cache_key(other, 0.1)
+
+    def test_key_sensitive_to_sampling_params(self):
+        messages = [HumanMessage(content="q")]
+        assert response_cache_key(messages, 0.1) != response_cache_key(messages, 0.2)
+        assert response_cache_key(messages, 0.1, 1024) != response_cache_key(messages, 0.1)
+
+    def test_invoke_cached_skips_second_call(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MagicMock(content="answer")
+        messages = [HumanMessage(content="cache me")]
+
+        first = invoke_cached(llm, messages, 0.1)
+        second = invoke_cached(llm, messages, 0.1)
+
+        assert first["content"] == "answer"
+        assert second == first
+        llm.invoke.assert_called_once()
+
+
+class TestRateLimitMiddleware:
+    def _request(self, request_factory, ip="10.0.0.1"):
+        return request_factory.get("/api/v1/test/", REMOTE_ADDR=ip)
+
+    def test_under_limit_passes_with_headers(self, request_factory):
+        middleware = RateLimitMiddleware(lambda request: HttpResponse())
+        response = middleware(self._request(request_factory))
+        assert response.status_code == 200
+        assert response["X-RateLimit-Limit"] == "20"
+        assert "X-RateLimit-Remaining" in response
+
+    def test_over_limit_returns_429(self, request_factory):
+        middleware = RateLimitMiddleware(lambda request: HttpResponse())
+        for _ in range(20):
+            assert middleware(self._request(request_factory)).status_code == 200
+        assert middleware(self._request(request_factory)).status_code == 429
+
+    def test_non_api_paths_not_limited(self, request_factory):
+        middleware = RateLimitMiddleware(lambda request: HttpResponse())
+        for _ in range(30):
+            response = middleware(request_factory.get("/health/"))
+            assert response.status_code == 200
+
+    def test_local_batching_skips_most_syncs(self, request_factory):
+        middleware = RateLimitMiddleware(lambda request: HttpResponse())
+        with patch.object(
+            RateLimitMiddleware, "_sync", side_effect=RateLimitMiddleware._sync
+        ) as mock_sync:
+            for _ in range(10):
+                middleware(self._request(request_factory))
+        # First request syncs, then one sync per _SYNC_EVERY increments —
+        # far fewer round-trips than requests.
+        assert mock_sync.call_count < 10
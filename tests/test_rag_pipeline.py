@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 from core.rag.chunking import chunk_document
+from core.rag.retriever import HybridRetriever
 
 
 class TestChunking:
@@ -46,8 +47,6 @@ class TestRetriever:
     @patch("core.rag.retriever.QdrantManager")
     @patch("core.rag.retriever.LLMFactory")
     def test_retrieve_returns_documents(self, mock_factory, mock_qdrant_cls):
-        from core.rag.retriever import HybridRetriever
-
         mock_embeddings = MagicMock()
         mock_embeddings.embed_query.return_value = [0.1] * 1536
         mock_factory.get_embeddings.return_value = mock_embeddings
@@ -76,8 +75,6 @@ class TestRetriever:
     @patch("core.rag.retriever.QdrantManager")
     @patch("core.rag.retriever.LLMFactory")
     def test_retrieve_empty_results(self, mock_factory, mock_qdrant_cls):
-        from core.rag.retriever import HybridRetriever
-
         mock_embeddings = MagicMock()
         mock_embeddings.embed_query.return_value = [0.1] * 1536
         mock_factory.get_embeddings.return_value = mock_embeddings